@@ -1,4 +1,8 @@
+import asyncio
 import json
+import os
+import sqlite3
+import threading
 from pathlib import Path
 from typing import Optional
 from logger import logger
@@ -7,13 +11,63 @@ from logger import logger
 class CookieManager:
     """Manages Twitter cookie storage for encrypted data"""
 
-    def __init__(self, storage_dir: str = "cookies"):
+    def __init__(self, storage_dir: str = "cookies", db_filename: str = "cookies.db"):
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(exist_ok=True)
 
+        # One SQLite database instead of a JSON file per user: a single
+        # reused descriptor and page cache replace the per-request
+        # open/read/close syscall churn, and WAL mode keeps readers and
+        # writers from blocking each other
+        self.db_path = str(self.storage_dir / db_filename)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cookies (
+                username TEXT PRIMARY KEY,
+                ct0 TEXT NOT NULL,
+                auth_token TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+        # The async wrappers run on worker threads, so serialize access to
+        # the shared connection
+        self._lock = threading.Lock()
+
+        self._import_legacy_files()
+
+    def _import_legacy_files(self):
+        """One-time import of per-user username.json files into the database"""
+        try:
+            with os.scandir(self.storage_dir) as entries:
+                legacy = [
+                    entry for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False)
+                ]
+            if not legacy:
+                return
+
+            with self._lock:
+                for entry in legacy:
+                    try:
+                        with open(entry.path, 'r', encoding='utf-8') as f:
+                            data = json.load(f)
+                        self._conn.execute(
+                            "INSERT OR IGNORE INTO cookies(username, ct0, auth_token) VALUES (?, ?, ?)",
+                            (entry.name[:-5], data['ct0'], data['auth_token'])
+                        )
+                        os.remove(entry.path)
+                    except Exception as e:
+                        logger.error("Could not import legacy cookie file %s: %s", entry.name, e)
+                self._conn.commit()
+            logger.info("Imported %d legacy cookie files into %s", len(legacy), self.db_path)
+        except Exception as e:
+            logger.error("Error importing legacy cookie files: %s", e)
+
     def save_cookie(self, username: str, ct0: str, auth_token: str) -> bool:
         """
-        Save already-encrypted cookie data to username.json file
+        Save already-encrypted cookie data for a username
 
         Args:
             username: Twitter username
@@ -24,24 +78,22 @@ class CookieManager:
             bool: True if successful, False otherwise
         """
         try:
-            cookie_data = {
-                "ct0": ct0,
-                "auth_token": auth_token
-            }
-
-            # Store the already-encrypted data as JSON
-            # The ct0 and auth_token are already encrypted by the client
-            json_str = json.dumps(cookie_data)
-
-            # Save to file (no additional encryption - data is already encrypted)
-            file_path = self.storage_dir / f"{username}.json"
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(json_str)
-
-            logger.info(f"Cookie saved successfully for user: {username}")
+            # The ct0 and auth_token are already encrypted by the client;
+            # no additional encryption is applied here
+            with self._lock:
+                self._conn.execute(
+                    """
+                    INSERT INTO cookies(username, ct0, auth_token) VALUES (?, ?, ?)
+                    ON CONFLICT(username) DO UPDATE SET ct0=excluded.ct0, auth_token=excluded.auth_token
+                    """,
+                    (username, ct0, auth_token)
+                )
+                self._conn.commit()
+
+            logger.info("Cookie saved successfully for user: %s", username)
             return True
         except Exception as e:
-            logger.error(f"Error saving cookie for {username}: {e}")
+            logger.error("Error saving cookie for %s: %s", username, e)
             return False
 
     def get_cookie(self, username: str) -> Optional[str]:
@@ -55,27 +107,30 @@ class CookieManager:
             str: JSON string with encrypted ct0 and auth_token, or None if not found
         """
         try:
-            file_path = self.storage_dir / f"{username}.json"
-
-            if not file_path.exists():
-                logger.warning(f"Cookie not found for user: {username}")
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT ct0, auth_token FROM cookies WHERE username = ?",
+                    (username,)
+                ).fetchone()
+
+            if row is None:
+                logger.warning("Cookie not found for user: %s", username)
                 return None
 
-            # Read encrypted data (stored as JSON with encrypted values)
-            with open(file_path, 'r', encoding='utf-8') as f:
-                encrypted_data = f.read()
-
-            logger.info(f"Cookie retrieved successfully for user: {username}")
+            logger.info("Cookie retrieved successfully for user: %s", username)
             # Return the JSON string with encrypted ct0 and auth_token
-            return encrypted_data
+            return json.dumps(
+                {"ct0": row[0], "auth_token": row[1]},
+                separators=(',', ':')
+            )
 
         except Exception as e:
-            logger.error(f"Error retrieving cookie for {username}: {e}")
+            logger.error("Error retrieving cookie for %s: %s", username, e)
             return None
 
     def delete_cookie(self, username: str) -> bool:
         """
-        Delete cookie file for username
+        Delete cookie data for username
 
         Args:
             username: Twitter username
@@ -84,17 +139,41 @@ class CookieManager:
             bool: True if successful, False otherwise
         """
         try:
-            file_path = self.storage_dir / f"{username}.json"
-            if file_path.exists():
-                file_path.unlink()
-                logger.info(f"Cookie deleted successfully for user: {username}")
+            with self._lock:
+                cursor = self._conn.execute(
+                    "DELETE FROM cookies WHERE username = ?", (username,)
+                )
+                self._conn.commit()
+
+            if cursor.rowcount > 0:
+                logger.info("Cookie deleted successfully for user: %s", username)
                 return True
-            logger.warning(f"Cookie file not found for deletion: {username}")
+            logger.warning("Cookie not found for deletion: %s", username)
             return False
         except Exception as e:
-            logger.error(f"Error deleting cookie for {username}: {e}")
+            logger.error("Error deleting cookie for %s: %s", username, e)
             return False
 
+    # Async variants run the blocking database I/O in a worker thread so web
+    # handlers never stall the event loop; prefer these from async contexts
+    # and keep the sync methods for CLI/scripts.
+
+    async def asave_cookie(self, username: str, ct0: str, auth_token: str) -> bool:
+        """Async wrapper around save_cookie (runs off the event loop)"""
+        return await asyncio.to_thread(self.save_cookie, username, ct0, auth_token)
+
+    async def aget_cookie(self, username: str) -> Optional[str]:
+        """Async wrapper around get_cookie (runs off the event loop)"""
+        return await asyncio.to_thread(self.get_cookie, username)
+
+    async def adelete_cookie(self, username: str) -> bool:
+        """Async wrapper around delete_cookie (runs off the event loop)"""
+        return await asyncio.to_thread(self.delete_cookie, username)
+
+    async def alist_cookies(self) -> list:
+        """Async wrapper around list_cookies (runs off the event loop)"""
+        return await asyncio.to_thread(self.list_cookies)
+
     def list_cookies(self) -> list:
         """
         List all stored usernames
@@ -103,10 +182,13 @@ class CookieManager:
             list: List of usernames with stored cookies
         """
         try:
-            cookie_files = list(self.storage_dir.glob("*.json"))
-            usernames = [f.stem for f in cookie_files]
-            logger.info(f"Listed {len(usernames)} stored cookies")
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT username FROM cookies ORDER BY username"
+                ).fetchall()
+            usernames = [row[0] for row in rows]
+            logger.info("Listed %d stored cookies", len(usernames))
             return usernames
         except Exception as e:
-            logger.error(f"Error listing cookies: {e}")
+            logger.error("Error listing cookies: %s", e)
             return []
@@ -1,92 +1,341 @@
 import asyncio
+import heapq
 import json
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
 import asyncpg
-from sqlalchemy import create_engine, text
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import NullPool
 import os
+from operator import itemgetter
 from pathlib import Path
 from logger import logger
 
 
+# (snake_case key, camelCase alias, default) triplets for normalizing incoming
+# tweets; the snake_case keys match the tweets table columns
+TWEET_KEY_ALIASES = (
+    ('tweet_id', 'tweetId', None),
+    ('user_id', 'userId', None),
+    ('username', 'username', None),
+    ('display_name', 'displayName', None),
+    ('text', 'text', None),
+    ('created_at', 'createdAt', None),
+    ('tweet_url', 'tweetUrl', None),
+    ('hashtags', 'hashtags', []),
+    ('followers_count', 'followersCount', 0),
+    ('following_count', 'followingCount', 0),
+    ('verified', 'verified', False),
+    ('language', 'language', None),
+    ('retweet_count', 'retweetCount', 0),
+    ('reply_count', 'replyCount', 0),
+    ('quote_count', 'quoteCount', 0),
+    ('like_count', 'likeCount', 0),
+    ('bookmark_count', 'bookmarkCount', 0),
+    ('view_count', 'viewCount', 0),
+    ('conversation_id', 'conversationId', None),
+    ('user_blue_verified', 'userBlueVerified', False),
+    ('user_location', 'userLocation', None),
+    ('user_description', 'userDescription', None),
+    ('profile_image_url', 'profileImageUrl', None),
+    ('cover_picture_url', 'coverPictureUrl', None),
+    ('media', 'media', []),
+)
+
+
+# Column order used for COPY into the staging table (text_tsv is trigger-populated)
+TWEET_COLUMNS = (
+    'tweet_id', 'user_id', 'username', 'display_name', 'text', 'created_at', 'tweet_url',
+    'hashtags', 'followers_count', 'following_count', 'verified',
+    'language', 'retweet_count', 'reply_count', 'quote_count', 'like_count',
+    'bookmark_count', 'view_count', 'conversation_id', 'user_blue_verified',
+    'user_location', 'user_description', 'profile_image_url', 'cover_picture_url', 'media'
+)
+
+# C-level tuple builder over normalized tweets, compiled once at import
+_tweet_record_getter = itemgetter(*TWEET_COLUMNS)
+
+
+# Hoisted so every call hits the same per-connection prepared-statement cache
+# entry. websearch_to_tsquery keeps the plain-keyword API but also accepts
+# quoted phrases and -exclusions; the CTE computes the tsquery once.
+# Counts and arrays are COALESCEd server-side so consumers never need
+# per-row default-filling branches in Python.
+SEARCH_QUERY = """
+    WITH q AS (SELECT websearch_to_tsquery('english', $1) AS tsq)
+    SELECT tweet_id, user_id, username, display_name, text, created_at, tweet_url,
+           COALESCE(hashtags, '{}') AS hashtags,
+           COALESCE(followers_count, 0) AS followers_count,
+           COALESCE(following_count, 0) AS following_count,
+           COALESCE(verified, FALSE) AS verified,
+           language,
+           COALESCE(retweet_count, 0) AS retweet_count,
+           COALESCE(reply_count, 0) AS reply_count,
+           COALESCE(quote_count, 0) AS quote_count,
+           COALESCE(like_count, 0) AS like_count,
+           COALESCE(bookmark_count, 0) AS bookmark_count,
+           COALESCE(view_count, 0) AS view_count,
+           conversation_id,
+           COALESCE(user_blue_verified, FALSE) AS user_blue_verified,
+           user_location, user_description, profile_image_url, cover_picture_url,
+           COALESCE(media, '{}') AS media
+    FROM tweets, q
+    WHERE text_tsv @@ q.tsq
+    ORDER BY created_at DESC
+    LIMIT $2
+"""
+
+
+# Parameterized insert used for small batches, where the COPY staging-table
+# setup would cost more than it saves
+INSERT_TWEET_SQL = (
+    f"INSERT INTO tweets ({', '.join(TWEET_COLUMNS)}) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(TWEET_COLUMNS) + 1))}) "
+    "ON CONFLICT DO NOTHING"
+)
+
+# Below this many rows, executemany beats COPY once staging overhead counts
+COPY_THRESHOLD = 100
+
+
+# Month-abbreviation lookup for the hand-rolled timestamp parser below
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12,
+}
+
+
+def parse_created_at(value):
+    """
+    Parse a Twitter-format timestamp string into a timezone-aware datetime
+
+    The format is fixed-width ("Mon Jan 19 21:23:43 +0000 2026"), so slicing
+    out the fields directly is several times faster than strptime, which
+    recompiles its format regex and consults the locale on every call.
+    Anything that doesn't fit the fast path falls back to strptime.
+    """
+    if isinstance(value, datetime):
+        return value
+    try:
+        if value[20:25] == '+0000':
+            return datetime(
+                int(value[26:30]), _MONTHS[value[4:7]], int(value[8:10]),
+                int(value[11:13]), int(value[14:16]), int(value[17:19]),
+                tzinfo=timezone.utc
+            )
+    except (KeyError, ValueError, IndexError, TypeError):
+        pass
+    return datetime.strptime(value, "%a %b %d %H:%M:%S %z %Y")
+
+
+def normalize_tweet(tweet: dict):
+    """
+    Normalize a tweet dict in place to snake_case keys with defaults filled
+
+    One pass over the alias table replaces the per-field
+    .get(camelCase) or .get(snake_case) double-lookup chains.
+    """
+    for snake, camel, default in TWEET_KEY_ALIASES:
+        value = tweet.get(snake)
+        if value is None:
+            value = tweet.get(camel, default)
+            if value is None:
+                value = default
+        tweet[snake] = value
+    tweet['created_at'] = parse_created_at(tweet['created_at'])
+
+
 class DatabaseManager:
     """Manages multiple PostgreSQL databases for Twitter data storage"""
 
+    # Shared across instances: config_path -> (mtime, parsed dict)
+    _config_cache: Dict[str, tuple] = {}
+
     def __init__(self, config_path: str = "config.json"):
         self.config_path = config_path
         self.config = self._load_config()
         self.databases = self.config.get("databases", [])
         self.current_db_index = self.config.get("current_db_index", 0)
         self.db_size_limit_mb = self.config.get("db_size_limit_mb", 1000)
+        self._pools: Dict[str, asyncpg.Pool] = {}
+        self._pools_lock = asyncio.Lock()
+        # Pool sizing: every uvicorn worker process builds its own pools, so
+        # the defaults divide a budget of ~80 server connections (stock
+        # Postgres max_connections=100, minus headroom) across workers and
+        # databases. Override with db_pool_min_size / db_pool_max_size in
+        # config.json when the database server has more capacity.
+        workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+        per_pool_budget = max(80 // (workers * max(len(self.databases), 1)), 2)
+        self._pool_max_size = self.config.get("db_pool_max_size", per_pool_budget)
+        self._pool_min_size = self.config.get(
+            "db_pool_min_size", min(2, self._pool_max_size)
+        )
+        self._size_cache: Dict[str, tuple] = {}  # db name -> (size_mb, monotonic timestamp)
+        self._size_ttl = self.config.get("db_size_cache_ttl_seconds", 60)
+        self._size_refresh_task = None
+        self._size_check_every_batches = self.config.get("size_check_every_batches", 100)
+        self._inserts_since_size_check = 0
+        self._last_size_check = 0.0
+
+    @staticmethod
+    async def _warm_search_statement(conn):
+        """
+        Pool setup hook: run the hot search statement once with inert
+        arguments so every freshly established connection already has it in
+        its statement cache — searches never pay the Parse/plan cost, not
+        even on first use of a connection.
+        """
+        try:
+            await conn.fetch(SEARCH_QUERY, '', 0)
+        except Exception:
+            pass  # Table may not exist yet during first-time initialization
+
+    async def _get_pool(self, db_config: dict) -> asyncpg.Pool:
+        """Get (or lazily create) a persistent connection pool for a database"""
+        db_name = db_config['name']
+        pool = self._pools.get(db_name)
+        if pool is None:
+            # Serialize creation: without the lock, two tasks racing a
+            # database's first use would each build a pool and the loser's
+            # would leak its connections for the process lifetime
+            async with self._pools_lock:
+                pool = self._pools.get(db_name)
+                if pool is None:
+                    pool = await asyncpg.create_pool(
+                        host=db_config['host'],
+                        port=db_config['port'],
+                        user=db_config['user'],
+                        password=db_config['password'],
+                        database=db_name,
+                        min_size=self._pool_min_size,
+                        max_size=self._pool_max_size,
+                        max_inactive_connection_lifetime=300,
+                        command_timeout=60,
+                        setup=DatabaseManager._warm_search_statement
+                    )
+                    self._pools[db_name] = pool
+        return pool
+
+    async def close_all_pools(self):
+        """Close all connection pools (call on shutdown)"""
+        for db_name, pool in self._pools.items():
+            try:
+                await pool.close()
+            except Exception as e:
+                logger.error("Error closing pool for %s: %s", db_name, e)
+        self._pools.clear()
 
     def _load_config(self) -> dict:
-        """Load database configuration from JSON file"""
+        """Load database configuration from JSON file (cached by file mtime)"""
         if os.path.exists(self.config_path):
+            mtime = os.stat(self.config_path).st_mtime
+            cached = DatabaseManager._config_cache.get(self.config_path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
             with open(self.config_path, 'r') as f:
-                return json.load(f)
+                config = json.load(f)
+
+            DatabaseManager._config_cache[self.config_path] = (mtime, config)
+            return config
         return {"databases": [], "current_db_index": 0, "db_size_limit_mb": 1000}
 
     def _save_config(self):
-        """Save current configuration to JSON file"""
-        with open(self.config_path, 'w') as f:
+        """Save current configuration to JSON file atomically"""
+        tmp_path = self.config_path + ".tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(self.config, f, indent=2)
+        os.replace(tmp_path, self.config_path)
+        DatabaseManager._config_cache[self.config_path] = (
+            os.stat(self.config_path).st_mtime, self.config
+        )
 
-    def _get_connection_string(self, db_config: dict) -> str:
-        """Generate PostgreSQL connection string"""
-        return f"postgresql://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['name']}"
+    async def check_database_size(self, db_config: dict, force_refresh: bool = False) -> float:
+        """
+        Check current database size in MB
 
-    def _get_async_connection_string(self, db_config: dict) -> str:
-        """Generate async PostgreSQL connection string"""
-        return f"postgresql+asyncpg://{db_config['user']}:{db_config['password']}@{db_config['host']}:{db_config['port']}/{db_config['name']}"
+        Results are cached with a TTL because pg_database_size stats every
+        file in the cluster and is too expensive to run on every insert.
+        Pass force_refresh=True to bypass the cache.
+        """
+        db_name = db_config['name']
 
-    async def check_database_size(self, db_config: dict) -> float:
-        """Check current database size in MB"""
-        conn_string = self._get_async_connection_string(db_config)
-        engine = create_async_engine(conn_string, poolclass=NullPool)
+        if not force_refresh:
+            cached = self._size_cache.get(db_name)
+            if cached and time.monotonic() - cached[1] < self._size_ttl:
+                return cached[0]
 
-        try:
-            async with engine.connect() as conn:
-                result = await conn.execute(
-                    text(f"""
-                        SELECT pg_database_size('{db_config['name']}') / 1024 / 1024 as size_mb
-                    """)
-                )
-                size_mb = float(result.scalar())
-                return size_mb
-        finally:
-            await engine.dispose()
+        pool = await self._get_pool(db_config)
+
+        async with pool.acquire() as conn:
+            size_mb = await conn.fetchval(
+                "SELECT pg_database_size($1) / 1024 / 1024 as size_mb",
+                db_name
+            )
+            size_mb = float(size_mb)
+            self._size_cache[db_name] = (size_mb, time.monotonic())
+            return size_mb
+
+    def cached_database_size(self, db_config: dict) -> Optional[float]:
+        """
+        Return the last known size for a database without touching Postgres
+
+        Serves hot paths that only report the size; returns None when no
+        measurement has been taken yet.
+        """
+        cached = self._size_cache.get(db_config['name'])
+        return cached[0] if cached else None
+
+    def start_size_refresher(self):
+        """Start the background task that keeps the size cache warm"""
+        if self._size_refresh_task is None or self._size_refresh_task.done():
+            self._size_refresh_task = asyncio.create_task(self._size_refresh_loop())
+
+    async def _size_refresh_loop(self):
+        """Periodically refresh the current database's size so inserts never block on it"""
+        while True:
+            await asyncio.sleep(self._size_ttl)
+            try:
+                current_db = self.databases[self.current_db_index]
+                await self.check_database_size(current_db, force_refresh=True)
+            except Exception as e:
+                logger.error("Error refreshing database size cache: %s", e)
 
     async def get_table_count(self, db_config: dict, table_name: str = "tweets") -> int:
         """Get total count of records in a table"""
         try:
-            conn = await asyncpg.connect(
-                host=db_config['host'],
-                port=db_config['port'],
-                user=db_config['user'],
-                password=db_config['password'],
-                database=db_config['name']
-            )
-            
-            try:
+            pool = await self._get_pool(db_config)
+
+            async with pool.acquire() as conn:
                 result = await conn.fetchval(f"SELECT COUNT(*) FROM {table_name}")
                 return result or 0
-            finally:
-                await conn.close()
         except Exception as e:
-            logger.error(f"Error getting count from {db_config['name']}: {e}")
+            logger.error("Error getting count from %s: %s", db_config['name'], e)
             return 0
 
     async def get_current_database(self) -> dict:
         """Get current active database configuration"""
         current_db = self.databases[self.current_db_index]
 
-        # Check if database size exceeds limit
+        # Database size changes slowly relative to insert cadence, so only
+        # sample it every N batches (or after the cache TTL), returning the
+        # cached config directly between checks.
+        self._inserts_since_size_check += 1
+        if (self._inserts_since_size_check < self._size_check_every_batches
+                and time.monotonic() - self._last_size_check < self._size_ttl):
+            return current_db
+
+        self._inserts_since_size_check = 0
+        self._last_size_check = time.monotonic()
+
+        # Check if database size exceeds limit (cached value on the hot path)
         size_mb = await self.check_database_size(current_db)
 
         if size_mb > self.db_size_limit_mb:
-            logger.warning(f"Database {current_db['name']} size {size_mb:.2f} MB exceeds limit {self.db_size_limit_mb} MB")
+            # Confirm with a fresh query before actually rotating
+            size_mb = await self.check_database_size(current_db, force_refresh=True)
+
+        if size_mb > self.db_size_limit_mb:
+            logger.warning("Database %s size %.2f MB exceeds limit %s MB", current_db['name'], size_mb, self.db_size_limit_mb)
             # Switch to next database
             next_index = (self.current_db_index + 1) % len(self.databases)
 
@@ -98,106 +347,106 @@ class DatabaseManager:
                 self.current_db_index = next_index
                 self.databases[self.current_db_index]['is_active'] = True
                 self.config['current_db_index'] = self.current_db_index
-                self._save_config()
+                # Run the disk write off the event loop so rotation never
+                # stalls other coroutines on file I/O. With multiple uvicorn
+                # workers each process rotates independently, so
+                # current_db_index can briefly diverge across workers; that is
+                # accepted — the check is size-based, so every worker lands on
+                # the same next database, and the rewrite is an atomic replace
+                await asyncio.to_thread(self._save_config)
 
                 current_db = self.databases[self.current_db_index]
-                logger.info(f"Switched to database: {current_db['name']} (previous size: {size_mb:.2f} MB)")
+                logger.info("Switched to database: %s (previous size: %.2f MB)", current_db['name'], size_mb)
             else:
-                logger.error(f"All databases ({len(self.databases)}) are full!")
+                logger.error("All databases (%d) are full!", len(self.databases))
         else:
-            logger.debug(f"Database {current_db['name']} size: {size_mb:.2f} MB / {self.db_size_limit_mb} MB")
+            logger.debug("Database %s size: %.2f MB / %s MB", current_db['name'], size_mb, self.db_size_limit_mb)
 
         return current_db
 
     async def initialize_database(self, db_config: dict):
         """Initialize database with required table and full-text search index"""
-        conn_string = self._get_async_connection_string(db_config)
-        engine = create_async_engine(conn_string, poolclass=NullPool)
-
-        try:
-            async with engine.connect() as conn:
-                # Create tweets table
-                await conn.execute(text("""
-                    CREATE TABLE IF NOT EXISTS tweets (
-                        tweet_id TEXT PRIMARY KEY,
-                        user_id TEXT,
-                        username TEXT,
-                        display_name TEXT,
-                        text TEXT,
-                        created_at TIMESTAMPTZ,
-                        tweet_url TEXT,
-                        hashtags TEXT[],
-                        followers_count INT4,
-                        following_count INT4,
-                        verified BOOL,
-                        text_tsv TSVECTOR,
-                        language TEXT,
-                        retweet_count INT4,
-                        reply_count INT4,
-                        quote_count INT4,
-                        like_count INT4,
-                        bookmark_count INT4,
-                        view_count INT8,
-                        conversation_id TEXT,
-                        user_blue_verified BOOL,
-                        user_location TEXT,
-                        user_description TEXT,
-                        profile_image_url TEXT,
-                        cover_picture_url TEXT,
-                        media TEXT[]
-                    )
-                """))
-
-                # Create full-text search index using text_tsv column
-                await conn.execute(text("""
-                    CREATE INDEX IF NOT EXISTS idx_tweets_text_search
-                    ON tweets USING gin(text_tsv)
-                """))
-
-                # Create index on username for faster searches
-                await conn.execute(text("""
-                    CREATE INDEX IF NOT EXISTS idx_tweets_username
-                    ON tweets(username)
-                """))
-
-                # Create index on created_at for sorting
-                await conn.execute(text("""
-                    CREATE INDEX IF NOT EXISTS idx_tweets_created_at
-                    ON tweets(created_at DESC)
-                """))
-
-                # Create trigger function to update text_tsv automatically
-                await conn.execute(text("""
-                    CREATE OR REPLACE FUNCTION tweets_text_tsv_trigger() RETURNS trigger AS $$
-                    BEGIN
-                        NEW.text_tsv := to_tsvector('english', COALESCE(NEW.text, ''));
-                        RETURN NEW;
-                    END
-                    $$ LANGUAGE plpgsql
-                """))
-
-                # Create trigger to call the function on INSERT and UPDATE
-                await conn.execute(text("""
-                    DROP TRIGGER IF EXISTS tweets_text_tsv_update ON tweets
-                """))
-                await conn.execute(text("""
-                    CREATE TRIGGER tweets_text_tsv_update
-                    BEFORE INSERT OR UPDATE ON tweets
-                    FOR EACH ROW
-                    EXECUTE FUNCTION tweets_text_tsv_trigger()
-                """))
-
-                await conn.commit()
-                logger.info(f"Database {db_config['name']} initialized successfully")
-        finally:
-            await engine.dispose()
+        pool = await self._get_pool(db_config)
+
+        async with pool.acquire() as conn:
+            # All statements are independent DDL with no parameters, so issue
+            # them as one simple-query batch: a single round trip instead of
+            # one per statement. text_tsv is a STORED generated column, so
+            # Postgres computes it in C during INSERT — no per-row plpgsql
+            # trigger dispatch. Fixed-width columns are declared first,
+            # grouped by descending alignment, so rows carry minimal padding
+            # before the variable-width tail.
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS tweets (
+                    tweet_id TEXT PRIMARY KEY,
+                    created_at TIMESTAMPTZ,
+                    view_count INT8,
+                    followers_count INT4,
+                    following_count INT4,
+                    retweet_count INT4,
+                    reply_count INT4,
+                    quote_count INT4,
+                    like_count INT4,
+                    bookmark_count INT4,
+                    verified BOOL,
+                    user_blue_verified BOOL,
+                    user_id TEXT,
+                    username TEXT,
+                    display_name TEXT,
+                    text TEXT,
+                    tweet_url TEXT,
+                    language TEXT,
+                    conversation_id TEXT,
+                    user_location TEXT,
+                    user_description TEXT,
+                    profile_image_url TEXT,
+                    cover_picture_url TEXT,
+                    hashtags TEXT[],
+                    media TEXT[],
+                    text_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', COALESCE(text, ''))) STORED
+                );
+
+                ALTER TABLE tweets SET (toast_tuple_target = 8160);
+
+                CREATE INDEX IF NOT EXISTS idx_tweets_text_search
+                ON tweets USING gin(text_tsv) WITH (fastupdate = off);
+
+                CREATE INDEX IF NOT EXISTS idx_tweets_username
+                ON tweets(username) INCLUDE (created_at);
+
+                CREATE INDEX IF NOT EXISTS idx_tweets_created_at
+                ON tweets(created_at DESC);
+
+                CREATE INDEX IF NOT EXISTS idx_tweets_created_brin
+                ON tweets USING brin(created_at) WITH (pages_per_range = 32);
+
+                -- Retire the old trigger machinery, but only where text_tsv
+                -- really is generated; tables created by earlier versions
+                -- keep their trigger so tsv maintenance never silently stops
+                DO $cleanup$
+                BEGIN
+                    IF EXISTS (
+                        SELECT 1 FROM pg_attribute
+                        WHERE attrelid = 'tweets'::regclass
+                          AND attname = 'text_tsv'
+                          AND attgenerated = 's'
+                    ) THEN
+                        DROP TRIGGER IF EXISTS tweets_text_tsv_update ON tweets;
+                        DROP FUNCTION IF EXISTS tweets_text_tsv_trigger();
+                    END IF;
+                END
+                $cleanup$;
+            """)
+
+            logger.info("Database %s initialized successfully", db_config['name'])
 
     async def insert_tweet(self, tweet_data: list) -> tuple[int, int]:
         """
         Insert tweet data into current database (batch insert)
 
         Args:
-            tweet_data: List of tweet dictionaries
+            tweet_data: List of tweet dictionaries, or of tuples already in
+                TWEET_COLUMNS order (the fast path — no per-row dict is built)
 
         Returns:
             tuple: (inserted_count, failed_count)
@@ -209,90 +458,89 @@ class DatabaseManager:
         if not tweet_data:
             return 0, 0
 
+        records = tweet_data
+
         try:
-            conn = await asyncpg.connect(
-                host=current_db['host'],
-                port=current_db['port'],
-                user=current_db['user'],
-                password=current_db['password'],
-                database=current_db['name']
-            )
+            if isinstance(tweet_data[0], dict):
+                for tweet in tweet_data:
+                    normalize_tweet(tweet)
+                records = list(map(_tweet_record_getter, tweet_data))
+
+            pool = await self._get_pool(current_db)
+
+            async with pool.acquire() as conn:
+                if len(records) < COPY_THRESHOLD:
+                    # Small batch: one pipelined executemany round trip is
+                    # cheaper than creating and draining a staging table
+                    await conn.executemany(INSERT_TWEET_SQL, records)
+                    logger.info("Successfully batch inserted %d tweets", len(tweet_data))
+                    return len(tweet_data), 0
+
+                # COPY into a staging table, then insert with conflict handling.
+                # COPY streams rows over the binary protocol with no per-row
+                # parse, which is much faster than executemany for bulk loads.
+                # text_tsv is generated by Postgres on the final insert.
+                async with conn.transaction():
+                    await conn.execute("""
+                        CREATE TEMP TABLE tweets_stage
+                        (LIKE tweets INCLUDING DEFAULTS) ON COMMIT DROP
+                    """)
 
-            try:
-                # Check how many tweets already exist before insertion
-                # tweet_ids = [tweet['tweet_id'] for tweet in tweet_data]
-                # existing_tweets = await conn.fetch(
-                #     "SELECT tweet_id FROM tweets WHERE tweet_id = ANY($1)",
-                #     tweet_ids
-                # )
-                # existing_ids = {row['tweet_id'] for row in existing_tweets}
-                # conflict_count = len(existing_ids)
-
-                # Use executemany for batch insertion
-                # Convert camelCase JSON fields to snake_case database columns
-                # text_tsv is automatically populated by the trigger
-                await conn.executemany("""
-                    INSERT INTO tweets (
-                        tweet_id, user_id, username, display_name, text, created_at, tweet_url,
-                        hashtags, followers_count, following_count, verified,
-                        language, retweet_count, reply_count, quote_count, like_count,
-                        bookmark_count, view_count, conversation_id, user_blue_verified,
-                        user_location, user_description, profile_image_url, cover_picture_url, media
-                    ) VALUES (
-                        $1, $2, $3, $4, $5, to_timestamp($6, 'Dy Mon DD HH24:MI:SS TZ YYYY'), $7, $8, $9, $10, $11,
-                        $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24, $25
+                    await conn.copy_records_to_table(
+                        'tweets_stage', records=records, columns=list(TWEET_COLUMNS)
                     )
-                    ON CONFLICT DO NOTHING;
-                """,
-                    [
-                        (
-                            tweet.get('tweetId') or tweet.get('tweet_id'),
-                            tweet.get('userId') or tweet.get('user_id'),
-                            tweet.get('username'),
-                            tweet.get('displayName') or tweet.get('display_name'),
-                            tweet.get('text'),
-                            tweet.get('createdAt') or tweet.get('created_at'),  # Already a datetime/timestamptz
-                            tweet.get('tweetUrl') or tweet.get('tweet_url'),
-                            tweet.get('hashtags') or [],
-                            tweet.get('followersCount') or tweet.get('followers_count') or 0,
-                            tweet.get('followingCount') or tweet.get('following_count') or 0,
-                            tweet.get('verified') or False,
-                            tweet.get('language'),
-                            tweet.get('retweetCount') or tweet.get('retweet_count') or 0,
-                            tweet.get('replyCount') or tweet.get('reply_count') or 0,
-                            tweet.get('quoteCount') or tweet.get('quote_count') or 0,
-                            tweet.get('likeCount') or tweet.get('like_count') or 0,
-                            tweet.get('bookmarkCount') or tweet.get('bookmark_count') or 0,
-                            tweet.get('viewCount') or tweet.get('view_count') or 0,
-                            tweet.get('conversationId') or tweet.get('conversation_id'),
-                            tweet.get('userBlueVerified') or tweet.get('user_blue_verified') or False,
-                            tweet.get('userLocation') or tweet.get('user_location'),
-                            tweet.get('userDescription') or tweet.get('user_description'),
-                            tweet.get('profileImageUrl') or tweet.get('profile_image_url'),
-                            tweet.get('coverPictureUrl') or tweet.get('cover_picture_url'),
-                            tweet.get('media') or []
+
+                    await conn.execute("""
+                        INSERT INTO tweets (
+                            tweet_id, user_id, username, display_name, text, created_at, tweet_url,
+                            hashtags, followers_count, following_count, verified,
+                            language, retweet_count, reply_count, quote_count, like_count,
+                            bookmark_count, view_count, conversation_id, user_blue_verified,
+                            user_location, user_description, profile_image_url, cover_picture_url, media
                         )
-                        for tweet in tweet_data
-                    ]
-                )
-
-                # inserted_count = len(tweet_data) - conflict_count
-                # logger.info(f"Batch insert: {inserted_count} inserted, {conflict_count} conflicts out of {len(tweet_data)} total")
-                # return inserted_count, conflict_count
-                logger.info(f"Successfully batch inserted {len(tweet_data)} tweets")
+                        SELECT tweet_id, user_id, username, display_name, text,
+                               created_at, tweet_url,
+                               hashtags, followers_count, following_count, verified,
+                               language, retweet_count, reply_count, quote_count, like_count,
+                               bookmark_count, view_count, conversation_id, user_blue_verified,
+                               user_location, user_description, profile_image_url, cover_picture_url, media
+                        FROM tweets_stage
+                        ON CONFLICT DO NOTHING
+                    """)
+
+                logger.info("Successfully batch inserted %d tweets", len(tweet_data))
                 return len(tweet_data), 0
-            finally:
-                await conn.close()
         except Exception as e:
-            logger.error(f"Error inserting {len(tweet_data)} tweets: {e}")
-            
-            with open(f"{tweet_data[0]['tweet_id']}.json", 'w', encoding='utf-8') as f:
-                json.dump(tweet_data, f, indent= 2)
+            logger.error("Error inserting %d tweets: %s", len(tweet_data), e)
+
+            # Best-effort dump of the failed batch for later replay; guarded
+            # so it can never double-fault, and run off the event loop
+            try:
+                # tweet_id is TWEET_COLUMNS[0], so it's the first tuple field
+                batch_id = records[0][0] or 'unknown'
+
+                def _dump_failed_batch():
+                    payload = json.dumps(
+                        records, separators=(',', ':'), default=str
+                    ).encode()
+                    with open(f"{batch_id}.json", 'wb') as f:
+                        f.write(payload)
+
+                await asyncio.to_thread(_dump_failed_batch)
+            except Exception as dump_error:
+                logger.error("Could not dump failed batch: %s", dump_error)
 
             return 0, len(tweet_data)
 
-    async def search_all_databases(self, keyword: str, limit: int = 100) -> List[dict]:
-        """Search keyword across all databases in parallel"""
+    async def iter_search_results(self, keyword: str, limit: int = 100):
+        """
+        Yield merged search results across all databases, newest first
+
+        The per-database queries still run in parallel, but the K-way heap
+        merge is consumed lazily, so callers (e.g. a streaming response) get
+        the first row as soon as the gather completes instead of after the
+        whole merged list is materialized.
+        """
         search_tasks = []
 
         for db_config in self.databases:
@@ -301,63 +549,60 @@ class DatabaseManager:
         # Execute all searches in parallel
         results = await asyncio.gather(*search_tasks, return_exceptions=True)
 
-        # Merge and deduplicate results
-        all_tweets = []
-        seen_ids = set()
-
+        per_db_results = []
         for result in results:
             if isinstance(result, Exception):
-                logger.error(f"Search error: {result}")
-                continue
-
-            for tweet in result:
-                if tweet['tweet_id'] not in seen_ids:
-                    seen_ids.add(tweet['tweet_id'])
-                    all_tweets.append(tweet)
+                logger.error("Search error: %s", result)
+            elif result:
+                per_db_results.append(result)
+
+        # Each database already returns rows sorted by created_at DESC, so a
+        # K-way heap merge replaces the full O(N log N) sort. Dedup is one
+        # O(1) set probe per row, and because the merge yields newest-first,
+        # the first occurrence of a tweet_id is always the newest copy.
+        seen_ids = set()
 
-        # Sort by created_at descending
-        all_tweets.sort(key=lambda x: x['created_at'], reverse=True)
+        for tweet in heapq.merge(*per_db_results, key=itemgetter('created_at'), reverse=True):
+            if tweet['tweet_id'] not in seen_ids:
+                seen_ids.add(tweet['tweet_id'])
+                yield tweet
+                if len(seen_ids) >= limit:
+                    break
 
-        return all_tweets[:limit]
+    async def search_all_databases(self, keyword: str, limit: int = 100) -> List[dict]:
+        """Search keyword across all databases in parallel"""
+        return [tweet async for tweet in self.iter_search_results(keyword, limit)]
 
     async def _search_single_database(self, db_config: dict, keyword: str, limit: int) -> List[dict]:
         """Search a single database for keyword"""
-        conn_string = self._get_async_connection_string(db_config)
-
         try:
-            conn = await asyncpg.connect(
-                host=db_config['host'],
-                port=db_config['port'],
-                user=db_config['user'],
-                password=db_config['password'],
-                database=db_config['name']
-            )
-
-            try:
-                query = """
-                    SELECT tweet_id, user_id, username, display_name, text, created_at, tweet_url,
-                           hashtags, followers_count, following_count, verified,
-                           language, retweet_count, reply_count, quote_count, like_count,
-                           bookmark_count, view_count, conversation_id, user_blue_verified,
-                           user_location, user_description, profile_image_url, cover_picture_url, media
-                    FROM tweets
-                    WHERE text_tsv @@ plainto_tsquery('english', $1)
-                    ORDER BY created_at DESC
-                    LIMIT $2
-                """
-                rows = await conn.fetch(query, keyword, limit)
+            pool = await self._get_pool(db_config)
+
+            async with pool.acquire() as conn:
+                # conn.fetch pipelines Parse/Bind/Execute into a single round
+                # trip and caches the prepared statement per connection, so
+                # this is one RTT per search even on first use (an explicit
+                # conn.prepare() would await a separate Parse/Describe trip).
+                # SET LOCAL scopes the tuning to this transaction: extra
+                # work_mem keeps the top-N sort in memory and the seqscan
+                # nudge steers the planner onto the GIN index.
+                async with conn.transaction():
+                    await conn.execute(
+                        "SET LOCAL work_mem = '64MB'; SET LOCAL enable_seqscan = off;"
+                    )
+                    rows = await conn.fetch(SEARCH_QUERY, keyword, limit)
 
                 return [dict(row) for row in rows]
-            finally:
-                await conn.close()
         except Exception as e:
-            logger.error(f"Error searching database {db_config['name']}: {e}")
+            logger.error("Error searching database %s: %s", db_config['name'], e)
             return []
 
     async def initialize_all_databases(self):
-        """Initialize all databases with required tables"""
-        for db_config in self.databases:
-            try:
-                await self.initialize_database(db_config)
-            except Exception as e:
-                logger.error(f"Error initializing database {db_config['name']}: {e}")
+        """Initialize all databases with required tables (concurrently)"""
+        results = await asyncio.gather(
+            *(self.initialize_database(db_config) for db_config in self.databases),
+            return_exceptions=True
+        )
+        for db_config, result in zip(self.databases, results):
+            if isinstance(result, Exception):
+                logger.error("Error initializing database %s: %s", db_config['name'], result)
@@ -7,16 +7,194 @@ Sends hourly database status alerts to Discord webhook
 import asyncio
 import aiohttp
 import json
+import logging
+import mmap
 import os
-import glob
+import re
+import signal
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 from logger import logger
 
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+
 # Load environment variables
 load_dotenv()
 
+# Compiled once: matches "[2026-01-27 19:09:33] [ERROR] [component] message"
+# (optionally with microseconds) and captures the timestamp digits and the
+# rest. A bytes pattern so the scan can run on raw mmap'd lines and only
+# decode the few lines it actually keeps
+_LOG_LINE_RE = re.compile(
+    rb'^\[(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2})(?:\.\d+)?\] (.*)$'
+)
+
+
+def _tail_lines(path: str, max_lines: int = 2000) -> list:
+    """
+    Read only the last max_lines lines of a file, like the Linux tail command
+
+    Walks newline positions backwards over an mmap of the file, so only the
+    tail bytes are ever copied into Python — no buffered-reader pass over
+    the whole log and no per-line allocation for lines we never look at.
+    Lines are returned as raw bytes; callers decode only what they keep.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return []  # Empty file cannot be mapped
+
+        try:
+            pos = len(mm)
+            for _ in range(max_lines + 1):
+                nl = mm.rfind(b'\n', 0, pos)
+                if nl == -1:
+                    pos = 0
+                    break
+                pos = nl
+
+            tail = mm[pos:]
+        finally:
+            mm.close()
+
+    return tail.splitlines()[-max_lines:]
+
+
+def _collect_recent_errors(cutoff_time: datetime, log_entries: List[os.DirEntry],
+                           emit=None) -> List[str]:
+    """
+    Scan error log tails for entries newer than cutoff_time
+
+    Pure synchronous helper — blocking file I/O and parsing live here so the
+    caller can push the whole scan onto a worker thread with
+    asyncio.to_thread and keep the event loop free. When emit is given it is
+    called with each error as soon as it is found, letting the caller start
+    consuming results while the scan is still running.
+    """
+    errors = []
+    reached_cutoff = False
+
+    for entry in log_entries:
+        log_file = entry.path
+        try:
+            # Files are sorted newest-first by mtime, so the first file
+            # last written before the cutoff means every remaining file
+            # is older too — stop the whole scan, don't skip ahead
+            # (entry.stat() reuses the stat cached by os.scandir)
+            file_mtime = datetime.fromtimestamp(entry.stat().st_mtime)
+            if file_mtime < cutoff_time:
+                logger.debug("Log file predates cutoff, stopping scan: %s (modified: %s)", log_file, file_mtime)
+                break
+
+            logger.info("Analyzing error log: %s", log_file)
+
+            lines = _tail_lines(log_file, 2000)
+
+            # Process lines from newest to oldest (reverse order), staying
+            # in bytes — most lines are discarded, so only the handful that
+            # survive the filters ever pay for a unicode decode
+            for line in reversed(lines):
+                line = line.strip()
+                if not line:
+                    continue
+
+                try:
+                    # Cheap 1-byte guard before any regex work, then a
+                    # single compiled match replaces the find/split and
+                    # both strptime format attempts
+                    m = _LOG_LINE_RE.match(line) if line.startswith(b'[') else None
+                    if m:
+                        # The regex already validated the digit groups,
+                        # so build the datetime directly instead of
+                        # re-parsing a format string with strptime
+                        try:
+                            line_time = datetime(
+                                int(m[1]), int(m[2]), int(m[3]),
+                                int(m[4]), int(m[5]), int(m[6])
+                            )
+                        except (ValueError, TypeError):
+                            line_time = None
+
+                        # If we found a timestamp and it's recent, include the error
+                        if line_time and line_time >= cutoff_time:
+                            # Keep level and component, shorten the timestamp
+                            # Format: [timestamp] [LEVEL] [component] message -> [LEVEL] [component] message
+                            # First point a kept line becomes text
+                            error_part = m.group(7).decode('utf-8', 'ignore')
+                            short_timestamp = line_time.strftime("%H:%M:%S")
+                            formatted_error = f"`{short_timestamp}` {error_part}"
+                            if len(formatted_error) > 150:
+                                formatted_error = formatted_error[:147] + "..."
+                            errors.append(formatted_error)
+                            if emit is not None:
+                                emit(formatted_error)
+                        elif line_time and line_time < cutoff_time:
+                            # We've gone too far back; older files can
+                            # only be older still, so end the whole scan
+                            logger.debug("Reached old timestamp: %s, stopping analysis of %s", line_time, log_file)
+                            reached_cutoff = True
+                            break
+                    else:
+                        # If no proper timestamp format, check if it's a recent line anyway
+                        # (for continuation lines of stack traces, etc.)
+                        if len(errors) > 0 and len(errors) < 10:  # Only if we already have recent errors
+                            clean_line = line.decode('utf-8', 'ignore')
+                            if len(clean_line) > 100:
+                                clean_line = clean_line[:97] + "..."
+                            if clean_line and not clean_line.startswith('['):  # Don't add old timestamped lines
+                                errors.append(f"    {clean_line}")  # Indent continuation lines
+                                if emit is not None:
+                                    emit(f"    {clean_line}")
+
+                except Exception as e:
+                    # Guarded: this fires per bad line in the hot loop, so
+                    # don't even pay the logging-call overhead when debug is off
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Error parsing log line: %s", e)
+                    continue
+
+                # Limit to prevent too many errors
+                if len(errors) >= 15:
+                    break
+
+            # Stop once the cutoff was crossed, or if we already found
+            # enough errors in this file to fill the alert
+            if reached_cutoff or len(errors) >= 5:
+                break
+
+        except Exception as e:
+            logger.error("Error reading error log file %s: %s", log_file, e)
+            continue
+
+    # Remove duplicates while preserving order — dicts keep insertion
+    # order, so this is a single C-level pass over the list
+    return list(dict.fromkeys(errors))
+
+
+@dataclass
+class ErrorScan:
+    """
+    Outcome of a log scan
+
+    status is 'ok' (clean scan, nothing recent), 'failed' (the scan itself
+    broke) or 'errors' (items holds the formatted recent errors). Classifying
+    once here replaces the string-sentinel checks the formatter and the
+    summary log line each used to repeat.
+    """
+    status: str
+    items: List[str]
+
 
 class DiscordAlertService:
     """Handles Discord webhook alerts for database status"""
@@ -30,205 +208,173 @@ class DiscordAlertService:
         self.username = username
         # Default to localhost API server
         self.api_base_url = api_base_url or os.getenv("API_BASE_URL", "http://localhost:8000")
-        
-    async def get_recent_errors(self, hours: int = 1) -> List[str]:
+
+        # One session for the service lifetime so the connection pool,
+        # keep-alives and DNS cache survive between alerts
+        self._session = None
+
+        # Memoize the read-mostly status payload: (monotonic timestamp, dict)
+        self._status_cache = None
+        self._status_ttl = 300
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get (or lazily create) the shared aiohttp session"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=10,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75
+                ),
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self._session
+
+    async def aclose(self):
+        """Close the shared session (call on shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def get_recent_errors(self, hours: int = 1) -> ErrorScan:
         """Get recent errors from error log files within the specified hours"""
         try:
-            errors = []
             cutoff_time = datetime.now() - timedelta(hours=hours)
-            
-            # Look specifically for error log files in logs directory
-            error_log_pattern = "logs/error_*.log"
-            error_log_files = glob.glob(error_log_pattern)
-            
-            if not error_log_files:
+
+            # Look specifically for error log files in logs directory.
+            # os.scandir yields name + cached stat in a single pass, so
+            # matching and the mtime sort below avoid the extra stat()
+            # per file that glob + os.path.getmtime would issue
+            try:
+                with os.scandir("logs") as it:
+                    error_log_entries = [
+                        e for e in it
+                        if e.name.startswith("error_") and e.name.endswith(".log")
+                        and e.is_file(follow_symlinks=False)
+                    ]
+            except FileNotFoundError:
+                error_log_entries = []
+
+            if not error_log_entries:
                 logger.warning("No error log files found in logs/error_*.log pattern")
-                return ["No error log files found"]
-            
+                return ErrorScan('failed', ["No error log files found"])
+
             # Sort by modification time (newest first)
-            error_log_files.sort(key=lambda x: os.path.getmtime(x), reverse=True)
-            
-            logger.info(f"Analyzing {len(error_log_files)} error log files for recent errors...")
-            
-            for log_file in error_log_files:
+            error_log_entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+
+            logger.info(f"Analyzing {len(error_log_entries)} error log files for recent errors...")
+
+            # The tail-read and parse loop is blocking; run it on a worker
+            # thread so the event loop (and the concurrent health call)
+            # keeps making progress during the scan. The worker streams each
+            # hit into an asyncio.Queue so we can stop waiting as soon as
+            # enough errors have arrived instead of blocking on the full scan
+            loop = asyncio.get_running_loop()
+            results: asyncio.Queue = asyncio.Queue(maxsize=16)
+
+            def _enqueue(item: str):
                 try:
-                    # Check if file was modified recently (within last 2 hours to be safe)
-                    file_mtime = datetime.fromtimestamp(os.path.getmtime(log_file))
-                    if file_mtime < cutoff_time - timedelta(hours=1):  # Skip files older than 2 hours
-                        logger.debug(f"Skipping old log file: {log_file} (modified: {file_mtime})")
-                        continue
-                    
-                    logger.info(f"Analyzing error log: {log_file}")
-                    
-                    with open(log_file, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                    
-                    # Process lines from newest to oldest (reverse order)
-                    for line in reversed(lines[-2000:]):  # Check last 2000 lines
-                        line = line.strip()
-                        if not line:
-                            continue
-                        
-                        try:
-                            # Try to extract timestamp from log line
-                            # Expected format: "[2026-01-27 19:09:33] [ERROR] [component] message"
-                            if line.startswith('[') and '] [' in line:
-                                # Extract timestamp between first [ and ]
-                                timestamp_end = line.find(']')
-                                if timestamp_end > 0:
-                                    timestamp_part = line[1:timestamp_end]  # Remove the opening [
-                                    
-                                    # Try different timestamp formats
-                                    timestamp_formats = [
-                                        "%Y-%m-%d %H:%M:%S",  # 2026-01-27 19:09:33
-                                        "%Y-%m-%d %H:%M:%S.%f",  # with microseconds
-                                    ]
-                                    
-                                    line_time = None
-                                    for fmt in timestamp_formats:
-                                        try:
-                                            line_time = datetime.strptime(timestamp_part, fmt)
-                                            break
-                                        except ValueError:
-                                            continue
-                                    
-                                    # If we found a timestamp and it's recent, include the error
-                                    if line_time and line_time >= cutoff_time:
-                                        # Clean up the error line
-                                        clean_line = line.replace('\n', '').replace('\r', '')
-                                        if len(clean_line) > 150:
-                                            clean_line = clean_line[:147] + "..."
-                                        
-                                        # Extract just the error part (remove timestamp but keep level and component)
-                                        # Format: [timestamp] [LEVEL] [component] message -> [LEVEL] [component] message
-                                        parts = clean_line.split('] ', 1)
-                                        if len(parts) > 1:
-                                            error_part = parts[1]  # Everything after first ]
-                                            # Keep timestamp for context but make it shorter
-                                            short_timestamp = line_time.strftime("%H:%M:%S")
-                                            formatted_error = f"`{short_timestamp}` {error_part}"
-                                            errors.append(formatted_error)
-                                        else:
-                                            errors.append(clean_line)
-                                    elif line_time and line_time < cutoff_time:
-                                        # Stop processing this file if we've gone too far back
-                                        logger.debug(f"Reached old timestamp: {line_time}, stopping analysis of {log_file}")
-                                        break
-                            else:
-                                # If no proper timestamp format, check if it's a recent line anyway
-                                # (for continuation lines of stack traces, etc.)
-                                if len(errors) > 0 and len(errors) < 10:  # Only if we already have recent errors
-                                    clean_line = line.replace('\n', '').replace('\r', '')
-                                    if len(clean_line) > 100:
-                                        clean_line = clean_line[:97] + "..."
-                                    if clean_line.strip() and not clean_line.startswith('['):  # Don't add old timestamped lines
-                                        errors.append(f"    {clean_line}")  # Indent continuation lines
-                                        
-                        except Exception as e:
-                            logger.debug(f"Error parsing log line: {e}")
-                            continue
-                        
-                        # Limit to prevent too many errors
-                        if len(errors) >= 15:
-                            break
-                    
-                    # If we found errors in this file, we might not need to check older files
-                    if len(errors) >= 5:
-                        break
-                        
-                except Exception as e:
-                    logger.error(f"Error reading error log file {log_file}: {e}")
+                    results.put_nowait(item)
+                except asyncio.QueueFull:
+                    pass  # More than enough buffered already; drop the rest
+
+            scan_task = asyncio.create_task(asyncio.to_thread(
+                _collect_recent_errors, cutoff_time, error_log_entries,
+                lambda item: loop.call_soon_threadsafe(_enqueue, item)
+            ))
+
+            # Consume items as they arrive, deduping in insertion order,
+            # until the scan ends or 8 unique errors have been collected
+            collected: Dict[str, None] = {}
+            while len(collected) < 8:
+                getter = asyncio.create_task(results.get())
+                done, _ = await asyncio.wait(
+                    {getter, scan_task}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter in done:
+                    collected[getter.result()] = None
                     continue
-            
-            # Remove duplicates while preserving order
-            seen = set()
-            unique_errors = []
-            for error in errors:
-                if error not in seen:
-                    seen.add(error)
-                    unique_errors.append(error)
-            
+                getter.cancel()
+                # Scan finished — drain whatever is still queued
+                while len(collected) < 8:
+                    try:
+                        collected[results.get_nowait()] = None
+                    except asyncio.QueueEmpty:
+                        break
+                break
+
+            if scan_task.done():
+                exc = scan_task.exception()
+                if exc:
+                    raise exc
+            else:
+                # Enough errors before the scan ended; let it wind down in
+                # the background (it self-caps) without blocking the alert
+                scan_task.add_done_callback(lambda t: t.exception())
+
+            unique_errors = list(collected)
+
             if not unique_errors:
-                return ["✅ No errors found in the last hour"]
-            
+                return ErrorScan('ok', [])
+
             logger.info(f"Found {len(unique_errors)} unique recent errors")
-            return unique_errors[:8]  # Limit to 8 most recent errors
-            
+            return ErrorScan('errors', unique_errors[:8])  # Limit to 8 most recent errors
+
         except Exception as e:
             logger.error(f"Error analyzing error log files: {e}")
-            return [f"❌ Error analyzing error logs: {str(e)}"]
-        """Get current database status information"""
-        try:
-            current_db = await self.db_manager.get_current_database()
-            
-            # Get database size in GB
-            size_mb = await self.db_manager.check_database_size(current_db)
-            size_gb = round(size_mb / 1024, 2)
-            
-            # Get tweet count
-            tweet_count = await self.db_manager.get_table_count(current_db, "tweets")
-            
-            return {
-                "database_name": current_db['name'],
-                "tweet_count": tweet_count,
-                "size_gb": size_gb,
-                "size_mb": round(size_mb, 2),
-                "capacity_used_percent": round((size_mb / self.db_manager.db_size_limit_mb) * 100, 2),
-                "size_limit_mb": self.db_manager.db_size_limit_mb
-            }
-        except Exception as e:
-            logger.error(f"Error getting database status: {e}")
-            return {
-                "database_name": "unknown",
-                "tweet_count": 0,
-                "size_gb": 0.0,
-                "size_mb": 0.0,
-                "capacity_used_percent": 0.0,
-                "size_limit_mb": 0
-            }
-    
+            return ErrorScan('failed', [f"❌ Error analyzing error logs: {str(e)}"])
+
     async def get_database_status(self) -> Dict[str, Any]:
-        """Get current database status information from health API"""
+        """Get current database status information from health API (cached)"""
         try:
+            # Database size/count move slowly, so serve a recent status
+            # without re-querying the health API (which runs the size and
+            # count queries server-side) on every call
+            if self._status_cache and time.monotonic() - self._status_cache[0] < self._status_ttl:
+                return self._status_cache[1]
+
             health_url = f"{self.api_base_url}/health"
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.get(health_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
-                    if response.status == 200:
-                        health_data = await response.json()
-                        
-                        # Extract database status from health response
-                        if health_data.get("status") == "healthy" and "current_database_stats" in health_data:
-                            db_stats = health_data["current_database_stats"]
-                            
-                            return {
-                                "database_name": db_stats.get("name", "unknown"),
-                                "tweet_count": db_stats.get("tweet_count", 0),
-                                "size_gb": db_stats.get("size_gb", 0.0),
-                                "size_mb": db_stats.get("size_mb", 0.0),
-                                "capacity_used_percent": db_stats.get("capacity_used_percent", 0.0),
-                                "size_limit_mb": health_data.get("databases", {}).get("size_limit_mb", 0)
-                            }
-                        else:
-                            logger.warning(f"Health API returned unhealthy status: {health_data}")
-                            return {
-                                "database_name": "API Error",
-                                "tweet_count": 0,
-                                "size_gb": 0.0,
-                                "size_mb": 0.0,
-                                "capacity_used_percent": 0.0,
-                                "size_limit_mb": 0
-                            }
+
+            session = await self._get_session()
+            async with session.get(health_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if response.status == 200:
+                    health_data = await response.json()
+
+                    # Extract database status from health response
+                    if health_data.get("status") == "healthy" and "current_database_stats" in health_data:
+                        db_stats = health_data["current_database_stats"]
+
+                        status = {
+                            "database_name": db_stats.get("name", "unknown"),
+                            "tweet_count": db_stats.get("tweet_count", 0),
+                            "size_gb": db_stats.get("size_gb", 0.0),
+                            "size_mb": db_stats.get("size_mb", 0.0),
+                            "capacity_used_percent": db_stats.get("capacity_used_percent", 0.0),
+                            "size_limit_mb": health_data.get("databases", {}).get("size_limit_mb", 0)
+                        }
+                        # Only successful statuses are cached so failures
+                        # and recoveries show up immediately
+                        self._status_cache = (time.monotonic(), status)
+                        return status
                     else:
-                        logger.error(f"Health API returned status {response.status}: {await response.text()}")
+                        logger.warning(f"Health API returned unhealthy status: {health_data}")
                         return {
-                            "database_name": f"API Error ({response.status})",
+                            "database_name": "API Error",
                             "tweet_count": 0,
                             "size_gb": 0.0,
                             "size_mb": 0.0,
                             "capacity_used_percent": 0.0,
                             "size_limit_mb": 0
                         }
+                else:
+                    logger.error(f"Health API returned status {response.status}: {await response.text()}")
+                    return {
+                        "database_name": f"API Error ({response.status})",
+                        "tweet_count": 0,
+                        "size_gb": 0.0,
+                        "size_mb": 0.0,
+                        "capacity_used_percent": 0.0,
+                        "size_limit_mb": 0
+                    }
                         
         except asyncio.TimeoutError:
             logger.error(f"Timeout connecting to health API at {health_url}")
@@ -251,19 +397,23 @@ class DiscordAlertService:
                 "size_limit_mb": 0
             }
     
-    def format_discord_message(self, db_status: Dict[str, Any], recent_errors: List[str]) -> Dict[str, Any]:
-        """Format database status and recent errors into Discord webhook message"""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        # Format content with recent errors
-        if len(recent_errors) == 1 and "No errors found" in recent_errors[0]:
+    def format_discord_message(self, db_status: Dict[str, Any], error_scan: ErrorScan) -> Dict[str, Any]:
+        """Format database status and the error scan into Discord webhook message"""
+        # One clock read per message; reused for the title and the embed timestamp
+        now = datetime.now()
+        current_time = now.strftime("%Y-%m-%d %H:%M:%S")
+
+        # Branch on the scan classification instead of sniffing sentinel strings
+        if error_scan.status == 'ok':
             content = "✅ **Server Status: Healthy**\n🔍 No errors detected in the last hour"
-        elif len(recent_errors) == 1 and "Error analyzing logs" in recent_errors[0]:
-            content = f"⚠️ **Server Status: Log Analysis Failed**\n{recent_errors[0]}"
+        elif error_scan.status == 'failed':
+            content = f"⚠️ **Server Status: Log Analysis Failed**\n{error_scan.items[0] if error_scan.items else ''}"
         else:
-            content = f"🚨 **Recent Server Errors (Last Hour)**\n"
-            for i, error in enumerate(recent_errors[:5], 1):
-                content += f"`{i}.` {error}\n"
+            # Single join instead of += per line (quadratic on long lists)
+            content = "\n".join(
+                ["🚨 **Recent Server Errors (Last Hour)**"]
+                + [f"`{i}.` {error}" for i, error in enumerate(error_scan.items[:5], 1)]
+            )
         
         # Determine color based on capacity usage
         if db_status['capacity_used_percent'] >= 90:
@@ -300,7 +450,7 @@ class DiscordAlertService:
                             "inline": True
                         }
                     ],
-                    "timestamp": datetime.now().isoformat(),
+                    "timestamp": now.isoformat(),
                     "footer": {
                         "text": "Twitter Data API - Hourly Report"
                     }
@@ -309,43 +459,62 @@ class DiscordAlertService:
         }
     
     async def send_discord_alert(self, message: Dict[str, Any]) -> bool:
-        """Send message to Discord webhook"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    self.webhook_url,
-                    json=message,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
+        """Send message to Discord webhook, retrying transient failures"""
+        # Encode once up front; retries below reuse the same bytes instead
+        # of letting aiohttp re-serialize the dict on every attempt
+        payload = _json_dumps(message)
+        headers = {"Content-Type": "application/json"}
+
+        for attempt in range(3):
+            try:
+                session = await self._get_session()
+                async with session.post(self.webhook_url, data=payload, headers=headers) as response:
                     if response.status == 204:
                         logger.info("Discord alert sent successfully")
                         return True
-                    else:
-                        logger.error(f"Discord webhook failed with status {response.status}: {await response.text()}")
-                        return False
-        except Exception as e:
-            logger.error(f"Error sending Discord alert: {e}")
-            return False
+
+                    if response.status in (429, 500, 502, 503, 504):
+                        # Honor Discord's Retry-After on rate limits, fall
+                        # back to exponential backoff for server errors
+                        retry_after = response.headers.get("Retry-After")
+                        delay = float(retry_after) if retry_after else float(2 ** attempt)
+                        logger.warning(
+                            "Discord webhook returned %d, retrying in %.1fs (attempt %d/3)",
+                            response.status, delay, attempt + 1
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+
+                    logger.error(f"Discord webhook failed with status {response.status}: {await response.text()}")
+                    return False
+            except Exception as e:
+                logger.error(f"Error sending Discord alert: {e}")
+                if attempt == 2:
+                    return False
+                await asyncio.sleep(float(2 ** attempt))
+
+        return False
     
     async def send_status_alert(self) -> bool:
         """Get database status and recent errors, then send Discord alert"""
         try:
             logger.info("Generating database status alert...")
             
-            # Get current database status from health API
-            db_status = await self.get_database_status()
-            
-            # Get recent errors from logs
-            recent_errors = await self.get_recent_errors(hours=1)
-            
+            # The health API call and the log scan are independent —
+            # overlap the network wait with the disk scan
+            db_status, error_scan = await asyncio.gather(
+                self.get_database_status(),
+                self.get_recent_errors(hours=1)
+            )
+
             # Format Discord message
-            message = self.format_discord_message(db_status, recent_errors)
-            
+            message = self.format_discord_message(db_status, error_scan)
+
             # Send to Discord
             success = await self.send_discord_alert(message)
-            
+
             if success:
-                error_count = len([e for e in recent_errors if not ("No errors found" in e or "Error analyzing logs" in e)])
+                error_count = len(error_scan.items) if error_scan.status == 'errors' else 0
                 logger.info(f"Status alert sent: {db_status['database_name']} - {db_status['tweet_count']:,} tweets, {db_status['size_gb']} GB, {error_count} recent errors")
             else:
                 logger.error("Failed to send status alert")
@@ -358,28 +527,48 @@ class DiscordAlertService:
 
 
 async def run_hourly_alerts():
-    """Run hourly Discord alerts"""
+    """Run hourly Discord alerts on a drift-free schedule"""
     try:
         alert_service = DiscordAlertService()  # Will load from environment
-        
-        logger.info("Starting hourly Discord alert service...")
-        
-        try:
-            # Send status alert
-            await alert_service.send_status_alert()
-            
-        except KeyboardInterrupt:
-            logger.info("Discord alert service stopped by user")
-        except Exception as e:
-            logger.error(f"Error in hourly alert loop: {e}")
-            # Wait 5 minutes before retrying on error
-            await asyncio.sleep(300)
-                
     except ValueError as e:
         logger.error(f"Configuration error: {e}")
         logger.error("Please set DISCORD_WEBHOOK_URL in your .env file")
         return
 
+    logger.info("Starting hourly Discord alert service...")
+
+    # Stop cleanly on SIGINT/SIGTERM instead of relying on KeyboardInterrupt
+    # surfacing from inside asyncio.sleep
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            pass  # e.g. Windows event loop
+
+    # Anchor each run to an absolute monotonic deadline so the cadence is a
+    # true hour, not work_time + 3600, and never drifts
+    next_run = time.monotonic()
+
+    try:
+        while not stop.is_set():
+            try:
+                await alert_service.send_status_alert()
+            except Exception as e:
+                logger.error(f"Error in hourly alert loop: {e}")
+
+            next_run += 3600
+            delay = max(0, next_run - time.monotonic())
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass  # Deadline reached — send the next alert
+
+        logger.info("Discord alert service stopped")
+    finally:
+        await alert_service.aclose()
+
 
 async def send_test_alert():
     """Send a test alert immediately"""
@@ -387,8 +576,11 @@ async def send_test_alert():
         alert_service = DiscordAlertService()  # Will load from environment
         
         logger.info("Sending test Discord alert...")
-        success = await alert_service.send_status_alert()
-        
+        try:
+            success = await alert_service.send_status_alert()
+        finally:
+            await alert_service.aclose()
+
         if success:
             logger.info("Test alert sent successfully!")
         else:
@@ -1,8 +1,13 @@
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from datetime import datetime
 
+# Keep the listener referenced at module level so it isn't garbage-collected
+_queue_listener = None
+
 
 def setup_logger(name: str = "twitter_api") -> logging.Logger:
     """
@@ -36,27 +41,50 @@ def setup_logger(name: str = "twitter_api") -> logging.Logger:
         datefmt=date_format
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
 
-    # File handler for all logs
-    file_handler = logging.FileHandler(
+    # File handler for all logs — size-capped rotation keeps any single
+    # file bounded (which also keeps the alert service's log tailing cheap),
+    # and delay=True avoids opening files for handlers that never fire.
+    # File I/O happens on the queue listener thread, never on callers.
+    file_handler = RotatingFileHandler(
         logs_dir / f"app_{datetime.now().strftime('%Y%m%d')}.log",
-        encoding='utf-8'
+        maxBytes=64 * 1024 * 1024,
+        backupCount=7,
+        encoding='utf-8',
+        delay=True
     )
     file_handler.setLevel(logging.INFO)
     file_formatter = logging.Formatter(log_format, datefmt=date_format)
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
 
     # File handler for errors only
-    error_handler = logging.FileHandler(
+    error_handler = RotatingFileHandler(
         logs_dir / f"error_{datetime.now().strftime('%Y%m%d')}.log",
-        encoding='utf-8'
+        maxBytes=64 * 1024 * 1024,
+        backupCount=7,
+        encoding='utf-8',
+        delay=True
     )
     error_handler.setLevel(logging.ERROR)
     error_formatter = logging.Formatter(log_format, datefmt=date_format)
     error_handler.setFormatter(error_formatter)
-    logger.addHandler(error_handler)
+
+    # Decouple callers from handler I/O: the logger only enqueues records
+    # (microseconds, never blocks the asyncio event loop) while a single
+    # listener thread drains the queue into the console and file handlers
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    _queue_listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        error_handler,
+        respect_handler_level=True
+    )
+    _queue_listener.start()
 
     return logger
 
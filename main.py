@@ -1,78 +1,48 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field, ValidationError, field_validator
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
 from typing import List, Optional, Union
+import logging
+import msgspec
+import traceback
 import uvicorn
 import os
 from dotenv import load_dotenv
 
-from database_manager import DatabaseManager
+from database_manager import DatabaseManager, parse_created_at
 from cookie_manager import CookieManager
 from logger import logger
 
 load_dotenv()
 
 
-# Pydantic models for request/response
-class TweetData(BaseModel):
-    tweetId: str = Field(..., description="Unique tweet identifier")
-    username: str = Field(..., description="Twitter username")
-    text: str = Field(..., description="Tweet text content")
-    createdAt: str = Field(..., description="Creation timestamp (Twitter format: Mon Jan 19 21:23:43 +0000 2026)")
-    tweetUrl: str = Field(..., description="URL to the tweet")
-    hashtags: List[str] = Field(default_factory=list, description="List of hashtags")
-    userId: str = Field(..., description="User ID")
-    displayName: str = Field(..., description="Display name")
-    followersCount: int = Field(..., description="Number of followers")
-    followingCount: int = Field(..., description="Number of following")
-    verified: bool = Field(..., description="Verification status")
-    language: Optional[str] = Field(None, description="Tweet language code")
-    retweetCount: Optional[int] = Field(0, description="Number of retweets")
-    replyCount: Optional[int] = Field(0, description="Number of replies")
-    quoteCount: Optional[int] = Field(0, description="Number of quotes")
-    likeCount: Optional[int] = Field(0, description="Number of likes")
-    bookmarkCount: Optional[int] = Field(0, description="Number of bookmarks")
-    viewCount: Optional[str] = Field(None, description="Number of views (can be string or number)")
-    conversationId: Optional[str] = Field(None, description="Conversation ID")
-    userBlueVerified: Optional[bool] = Field(False, description="User blue verification status")
-    userLocation: Optional[str] = Field(None, description="User location")
-    userDescription: Optional[str] = Field(None, description="User description")
-    profileImageUrl: Optional[str] = Field(None, description="Profile image URL")
-    coverPictureUrl: Optional[str] = Field(None, description="Cover picture URL")
-    media: List[str] = Field(default_factory=list, description="List of media URLs")
-
-    @field_validator('viewCount', mode='before')
-    @classmethod
-    def validate_view_count(cls, v):
-        """Handle viewCount that can be string, int, or None"""
-        if v is None:
-            return None
-        if isinstance(v, (int, float)):
-            return str(int(v))
-        return str(v)
-
-
-class TweetResponse(BaseModel):
+# Incoming tweet schema as a msgspec Struct: the request body is decoded
+# and type-checked in one C-level pass instead of instantiating a Pydantic
+# model per tweet, which dominated CPU on large batch POSTs.
+# createdAt uses the Twitter format: Mon Jan 19 21:23:43 +0000 2026
+class TweetData(msgspec.Struct):
     tweetId: str
     username: str
     text: str
     createdAt: str
     tweetUrl: str
-    hashtags: List[str]
     userId: str
     displayName: str
     followersCount: int
     followingCount: int
     verified: bool
+    hashtags: List[str] = []
     language: Optional[str] = None
-    retweetCount: int = 0
-    replyCount: int = 0
-    quoteCount: int = 0
-    likeCount: int = 0
-    bookmarkCount: int = 0
-    viewCount: Optional[str] = None
+    retweetCount: Optional[int] = 0
+    replyCount: Optional[int] = 0
+    quoteCount: Optional[int] = 0
+    likeCount: Optional[int] = 0
+    bookmarkCount: Optional[int] = 0
+    # Can arrive as string or number; normalized after decode
+    viewCount: Union[str, int, float, None] = None
     conversationId: Optional[str] = None
-    userBlueVerified: bool = False
+    userBlueVerified: Optional[bool] = False
     userLocation: Optional[str] = None
     userDescription: Optional[str] = None
     profileImageUrl: Optional[str] = None
@@ -80,6 +50,84 @@ class TweetResponse(BaseModel):
     media: List[str] = []
 
 
+# Reusable decoder — schema compilation happens once at import time
+_tweet_list_decoder = msgspec.json.Decoder(List[TweetData])
+
+
+# Outgoing tweet schema: a slotted struct that msgspec's Encoder walks in C,
+# so the search stream never builds an intermediate dict per row
+class TweetOut(msgspec.Struct):
+    tweetId: str
+    username: str
+    text: str
+    createdAt: str
+    tweetUrl: str
+    hashtags: List[str]
+    userId: str
+    displayName: str
+    followersCount: int
+    followingCount: int
+    verified: bool
+    language: Optional[str]
+    retweetCount: int
+    replyCount: int
+    quoteCount: int
+    likeCount: int
+    bookmarkCount: int
+    viewCount: str
+    conversationId: Optional[str]
+    userBlueVerified: bool
+    userLocation: Optional[str]
+    userDescription: Optional[str]
+    profileImageUrl: Optional[str]
+    coverPictureUrl: Optional[str]
+    media: List[str]
+
+
+_tweet_encoder = msgspec.json.Encoder()
+
+# Shared immutable sentinel for empty hashtag/media arrays — one object
+# reused across every tweet instead of a fresh ~56-byte list each
+_EMPTY = ()
+
+
+def _encode_row(r) -> bytes:
+    """
+    Encode a snake_case tweet row from the database as camelCase JSON
+
+    Straight indexed lookups only — the search query COALESCEs counts and
+    arrays server-side, so there are no per-row default-filling branches
+    """
+    return _tweet_encoder.encode(TweetOut(
+        r['tweet_id'],
+        r['username'],
+        r['text'],
+        # Format datetime back to Twitter format
+        r['created_at'].strftime("%a %b %d %H:%M:%S %z %Y"),
+        r['tweet_url'],
+        r['hashtags'] or _EMPTY,
+        r['user_id'],
+        r['display_name'],
+        r['followers_count'],
+        r['following_count'],
+        r['verified'],
+        r['language'],
+        r['retweet_count'],
+        r['reply_count'],
+        r['quote_count'],
+        r['like_count'],
+        r['bookmark_count'],
+        str(r['view_count']),
+        r['conversation_id'],
+        r['user_blue_verified'],
+        r['user_location'],
+        r['user_description'],
+        r['profile_image_url'],
+        r['cover_picture_url'],
+        r['media'] or _EMPTY
+    ))
+
+
 class CookieSaveRequest(BaseModel):
     username: str = Field(..., description="Twitter username")
     ct0: str = Field(..., description="CSRF token (encrypted)")
@@ -92,12 +140,6 @@ class CookieResponse(BaseModel):
     error: Optional[str] = None
 
 
-class SearchResponse(BaseModel):
-    keyword: str
-    count: int
-    tweets: List[TweetResponse]
-
-
 class DataReceiveResponse(BaseModel):
     success: bool
     message: str
@@ -109,7 +151,10 @@ class DataReceiveResponse(BaseModel):
 app = FastAPI(
     title="Twitter Data API",
     description="API for storing and searching Twitter data with multi-database support",
-    version="1.0.0"
+    version="1.0.0",
+    # Every dict-returning endpoint serializes through orjson instead of
+    # jsonable_encoder + stdlib json
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -131,34 +176,59 @@ async def startup_event():
     """Initialize databases on startup"""
     logger.info("Starting server and initializing databases...")
     await db_manager.initialize_all_databases()
+    db_manager.start_size_refresher()
     logger.info(f"Server started with {len(db_manager.databases)} databases configured")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release pooled database connections on shutdown"""
+    logger.info("Shutting down, closing database connection pools...")
+    await db_manager.close_all_pools()
+
+
 # Add exception handler for validation errors
 @app.exception_handler(Exception)
 async def global_exception_handler(_, exc):
     """Global exception handler to catch and log all errors"""
-    logger.error(f"Unhandled exception: {type(exc).__name__}: {exc}")
-    import traceback
-    logger.error(f"Traceback: {traceback.format_exc()}")
-    raise HTTPException(status_code=500, detail=str(exc))
+    logger.error("Unhandled exception: %s: %s", type(exc).__name__, exc)
+    # Full tracebacks are debug-only: under a failure storm, formatting one
+    # per request allocates heavily and floods the logs
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Traceback: %s", traceback.format_exc())
+    # Raising HTTPException from an exception handler doesn't propagate —
+    # return the error response directly
+    return ORJSONResponse(status_code=500, content={"detail": str(exc)})
 
 
 @app.post("/api/data/receive", response_model=DataReceiveResponse)
-async def receive_data(tweets: List[TweetData]):
+async def receive_data(request: Request):
     """
     Receive and store tweet data (array of tweets)
 
-    - Accepts an array of tweets for batch insertion
+    - Accepts a JSON array of TweetData objects for batch insertion
     - Automatically detects database size and switches to new database if limit exceeded
     - Stores tweets in PostgreSQL with full-text search indexing
     - Supports multiple database servers with automatic failover
     - Returns success with count of inserted tweets and current database info
     """
     try:
+        # Decode the raw body straight into typed structs — one C-level
+        # parse+validate pass over the whole batch
+        raw_body = await request.body()
+        try:
+            tweets = _tweet_list_decoder.decode(raw_body)
+        except (msgspec.ValidationError, msgspec.DecodeError) as e:
+            raise HTTPException(status_code=422, detail=str(e))
+
+        # Normalize viewCount the way the old Pydantic validator did
+        for tweet in tweets:
+            if isinstance(tweet.viewCount, (int, float)):
+                tweet.viewCount = str(int(tweet.viewCount))
+
         if not tweets:
             logger.warning("Received empty tweet array")
-            return DataReceiveResponse(
+            return DataReceiveResponse.model_construct(
                 success=True,
                 message="No tweets provided",
                 current_database="",
@@ -170,63 +240,68 @@ async def receive_data(tweets: List[TweetData]):
         # Get current database info once for all tweets
         current_db = await db_manager.get_current_database()
 
-        # Prepare all tweets for batch insertion (map camelCase to snake_case)
-        tweet_dicts = []
-        for tweet in tweets:
-            tweet_dict = {
-                "tweet_id": tweet.tweetId,
-                "username": tweet.username,
-                "text": tweet.text,
-                "created_at": tweet.createdAt,  # Raw string for PostgreSQL to_timestamp
-                "tweet_url": tweet.tweetUrl,
-                "hashtags": tweet.hashtags,
-                "user_id": tweet.userId,
-                "display_name": tweet.displayName,
-                "followers_count": tweet.followersCount,
-                "following_count": tweet.followingCount,
-                "verified": tweet.verified,
-                "language": tweet.language,
-                "retweet_count": tweet.retweetCount if tweet.retweetCount is not None else 0,
-                "reply_count": tweet.replyCount if tweet.replyCount is not None else 0,
-                "quote_count": tweet.quoteCount if tweet.quoteCount is not None else 0,
-                "like_count": tweet.likeCount if tweet.likeCount is not None else 0,
-                "bookmark_count": tweet.bookmarkCount if tweet.bookmarkCount is not None else 0,
-                "view_count": int(tweet.viewCount) if tweet.viewCount else 0,
-                "conversation_id": tweet.conversationId,
-                "user_blue_verified": tweet.userBlueVerified if tweet.userBlueVerified is not None else False,
-                "user_location": tweet.userLocation,
-                "user_description": tweet.userDescription,
-                "profile_image_url": tweet.profileImageUrl,
-                "cover_picture_url": tweet.coverPictureUrl,
-                "media": tweet.media
-            }
-            tweet_dicts.append(tweet_dict)
+        # Pack each tweet straight into a tuple in TWEET_COLUMNS order —
+        # no intermediate 25-key dict per row; tuples feed COPY positionally
+        rows = [
+            (
+                t.tweetId,
+                t.userId,
+                t.username,
+                t.displayName,
+                t.text,
+                parse_created_at(t.createdAt),
+                t.tweetUrl,
+                t.hashtags or _EMPTY,
+                t.followersCount,
+                t.followingCount,
+                t.verified,
+                t.language,
+                t.retweetCount or 0,
+                t.replyCount or 0,
+                t.quoteCount or 0,
+                t.likeCount or 0,
+                t.bookmarkCount or 0,
+                int(t.viewCount) if t.viewCount else 0,
+                t.conversationId,
+                t.userBlueVerified or False,
+                t.userLocation,
+                t.userDescription,
+                t.profileImageUrl,
+                t.coverPictureUrl,
+                t.media or _EMPTY
+            )
+            for t in tweets
+        ]
 
         # Batch insert all tweets at once
-        logger.info(f"Batch inserting {len(tweet_dicts)} tweets into database: {current_db['name']}")
-        inserted_count, failed_count = await db_manager.insert_tweet(tweet_dicts)
+        logger.info(f"Batch inserting {len(rows)} tweets into database: {current_db['name']}")
+        inserted_count, failed_count = await db_manager.insert_tweet(rows)
 
-        # Get final database size
-        db_size = await db_manager.check_database_size(current_db)
+        # Report the last known size — the size cache and background
+        # refresher keep it current, so ingest never waits on
+        # pg_database_size
+        db_size = db_manager.cached_database_size(current_db)
 
         logger.info(f"Successfully inserted {inserted_count}/{len(tweets)} tweets, {failed_count} failed")
 
-        return DataReceiveResponse(
+        return DataReceiveResponse.model_construct(
             success=True,
             message=f"Successfully inserted {inserted_count} tweets, {failed_count} failed",
             current_database=current_db['name'],
-            database_size_mb=round(db_size, 2)
+            database_size_mb=round(db_size, 2) if db_size is not None else None
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error receiving tweet data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/search", response_model=SearchResponse)
+@app.get("/api/search", response_class=ORJSONResponse)
 async def search_keyword(
     keyword: str = Query(..., description="Search keyword"),
-    limit: int = Query(10000000, ge=1, le=1000, description="Maximum number of results")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of results")
 ):
     """
     Search tweets by keyword across all databases
@@ -243,52 +318,21 @@ async def search_keyword(
 
         logger.info(f"Searching for keyword: '{keyword}' with limit: {limit}")
 
-        # Search across all databases in parallel
-        results = await db_manager.search_all_databases(keyword, limit)
-
-        logger.info(f"Search completed: found {len(results)} results across all databases")
-
-        # Convert to response format (map snake_case to camelCase)
-        tweets = []
-        for r in results:
-            # Format datetime back to Twitter format
-            created_at_str = r['created_at'].strftime("%a %b %d %H:%M:%S %z %Y")
-
-            tweets.append(TweetResponse(
-                tweetId=r['tweet_id'],
-                username=r['username'],
-                text=r['text'],
-                createdAt=created_at_str,
-                tweetUrl=r['tweet_url'],
-                hashtags=r.get('hashtags', []),
-                userId=r['user_id'],
-                displayName=r['display_name'],
-                followersCount=r['followers_count'],
-                followingCount=r['following_count'],
-                verified=r['verified'],
-                language=r.get('language'),
-                retweetCount=r.get('retweet_count', 0),
-                replyCount=r.get('reply_count', 0),
-                quoteCount=r.get('quote_count', 0),
-                likeCount=r.get('like_count', 0),
-                bookmarkCount=r.get('bookmark_count', 0),
-                viewCount=str(r.get('view_count', 0)),
-                conversationId=r.get('conversation_id'),
-                userBlueVerified=r.get('user_blue_verified', False),
-                userLocation=r.get('user_location'),
-                userDescription=r.get('user_description'),
-                profileImageUrl=r.get('profile_image_url'),
-                coverPictureUrl=r.get('cover_picture_url'),
-                media=r.get('media', [])
-            ))
-
-        logger.info(f"Returning {len(tweets)} unique tweets to client")
-
-        return SearchResponse(
-            keyword=keyword,
-            count=len(tweets),
-            tweets=tweets
-        )
+        # Stream the JSON array chunk by chunk: each merged row is converted
+        # and orjson-encoded as it arrives, so the full serialized body is
+        # never materialized and the first bytes go out as soon as the
+        # per-database queries return. count trails the array for that reason.
+        async def stream_results():
+            yield b'{"keyword":' + _tweet_encoder.encode(keyword) + b',"tweets":['
+            count = 0
+            async for r in db_manager.iter_search_results(keyword, limit):
+                chunk = _encode_row(r)
+                yield chunk if count == 0 else b',' + chunk
+                count += 1
+            yield b'],"count":' + str(count).encode() + b'}'
+            logger.info(f"Returned {count} unique tweets to client")
+
+        return StreamingResponse(stream_results(), media_type="application/json")
 
     except HTTPException:
         raise
@@ -303,13 +347,13 @@ async def save_cookie(request: CookieSaveRequest):
     Save encrypted cookie data for a user
 
     - Expects ct0 and auth_token to be already encrypted by the client
-    - Stores the encrypted values directly to username.json file
+    - Stores the encrypted values in the local SQLite cookie store
     - No additional encryption is applied (data is already encrypted)
     - Returns the encrypted data when retrieved via /api/cookie/get/{username}
     """
     try:
         logger.info(f"Received cookie save request for user: {request.username}")
-        success = cookie_manager.save_cookie(
+        success = await cookie_manager.asave_cookie(
             username=request.username,
             ct0=request.ct0,
             auth_token=request.auth_token
@@ -342,18 +386,18 @@ async def get_cookie(username: str):
     """
     try:
         logger.info(f"Received cookie get request for user: {username}")
-        encrypted_data = cookie_manager.get_cookie(username)
+        encrypted_data = await cookie_manager.aget_cookie(username)
 
         if encrypted_data is None:
             logger.warning(f"Cookie get API: no data found for {username}")
-            return CookieResponse(
+            return CookieResponse.model_construct(
                 username=username,
                 encrypted_data=None,
                 error=f"No cookie found for user: {username}"
             )
 
         logger.info(f"Cookie get API: returning data for {username}")
-        return CookieResponse(
+        return CookieResponse.model_construct(
             username=username,
             encrypted_data=encrypted_data
         )
@@ -370,7 +414,7 @@ async def delete_cookie(username: str):
     """
     try:
         logger.info(f"Received cookie delete request for user: {username}")
-        success = cookie_manager.delete_cookie(username)
+        success = await cookie_manager.adelete_cookie(username)
 
         if success:
             logger.info(f"Cookie delete API: successfully deleted {username}")
@@ -396,7 +440,7 @@ async def list_cookies():
     """
     try:
         logger.info("Received cookie list request")
-        usernames = cookie_manager.list_cookies()
+        usernames = await cookie_manager.alist_cookies()
         logger.info(f"Cookie list API: returning {len(usernames)} users")
         return {
             "success": True,
@@ -442,7 +486,9 @@ async def health_check():
         # Get tweet count from current database
         tweet_count = await db_manager.get_table_count(current_db, "tweets")
         
-        return {
+        # Bypass even the response-class plumbing: hand the dict straight
+        # to orjson
+        return ORJSONResponse(content={
             "status": "healthy",
             "databases": {
                 "total_count": len(db_manager.databases),
@@ -457,27 +503,45 @@ async def health_check():
                 "size_mb": round(size_mb, 2),
                 "capacity_used_percent": round((size_mb / db_manager.db_size_limit_mb) * 100, 2)
             }
-        }
+        })
     except Exception as e:
         logger.error(f"Health check error: {e}")
-        return {
+        return ORJSONResponse(content={
             "status": "error",
             "error": str(e),
             "databases": {
                 "total_count": len(db_manager.databases) if db_manager.databases else 0,
                 "current_database": "unknown"
             }
-        }
+        })
 
 
 if __name__ == "__main__":
     server_host = os.getenv("SERVER_HOST", "0.0.0.0")
     server_port = int(os.getenv("SERVER_PORT", "8000"))
 
-    uvicorn.run(
-        "main:app",
-        host=server_host,
-        port=server_port,
-        reload=True,
-        log_level="info"
-    )
+    if os.getenv("DEV_RELOAD", "").lower() in ("1", "true", "yes"):
+        # Development: auto-reload (single worker, default loop)
+        uvicorn.run(
+            "main:app",
+            host=server_host,
+            port=server_port,
+            reload=True,
+            log_level="info"
+        )
+    else:
+        # Production: one worker per CPU (override with WEB_CONCURRENCY).
+        # uvloop and httptools ship with uvicorn[standard]; both are C
+        # implementations that cut event-loop and HTTP-parse overhead.
+        # asyncpg pools are created lazily after workers fork, so each
+        # worker gets its own pools; pool sizes scale down with the worker
+        # count (see DatabaseManager) to stay inside Postgres max_connections.
+        uvicorn.run(
+            "main:app",
+            host=server_host,
+            port=server_port,
+            workers=int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1)),
+            loop="uvloop",
+            http="httptools",
+            log_level="info"
+        )
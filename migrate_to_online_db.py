@@ -7,6 +7,7 @@ Migrates all data from local PostgreSQL databases to an online PostgreSQL databa
 import asyncio
 import json
 import sys
+import time
 from typing import List, Dict, Optional
 import asyncpg
 from sqlalchemy.ext.asyncio import create_async_engine
@@ -17,6 +18,55 @@ from datetime import datetime
 from logger import logger
 
 
+# Columns moved by the migration, in the tweets table's declared order; the
+# SELECT, COPY and INSERT statements are all generated from this one tuple,
+# so source Records line up with the destination without any reshuffling.
+# The source's generated text_tsv column is excluded: the online database
+# indexes the to_tsvector expression instead.
+MIGRATION_COLUMNS = (
+    "tweet_id", "username", "text", "created_at", "tweet_url", "hashtags",
+    "user_id", "display_name", "followers_count", "following_count",
+    "verified", "language", "retweet_count", "reply_count", "quote_count",
+    "like_count", "bookmark_count", "view_count", "conversation_id",
+    "user_blue_verified", "user_location", "user_description",
+    "profile_image_url", "cover_picture_url", "media",
+)
+
+_COLUMN_LIST = ", ".join(MIGRATION_COLUMNS)
+
+# Direct INSERT for batches too small to be worth COPY's staging round
+# trips; asyncpg prepares it once per connection and caches the plan, and
+# Records from the source cursor are passed to it unchanged
+INSERT_TWEET_SQL = f"""
+    INSERT INTO tweets ({_COLUMN_LIST})
+    VALUES ({', '.join(f'${i}' for i in range(1, len(MIGRATION_COLUMNS) + 1))})
+    ON CONFLICT DO NOTHING
+"""
+
+# Below this many rows, executemany beats the COPY + merge + truncate cycle
+COPY_THRESHOLD = 100
+
+
+async def _merge_batch(conn: asyncpg.Connection, target_table: str, rows) -> None:
+    """COPY rows into the session staging table and merge into target_table
+
+    One transaction per call: COPY, merge and truncate commit (and fsync)
+    once, and a failure rolls back to a clean staging table.
+    """
+    async with conn.transaction():
+        await conn.copy_records_to_table(
+            'tweets_stage',
+            records=rows,
+            columns=MIGRATION_COLUMNS
+        )
+        await conn.execute(f"""
+            INSERT INTO {target_table} ({_COLUMN_LIST})
+            SELECT {_COLUMN_LIST} FROM tweets_stage
+            ON CONFLICT DO NOTHING
+        """)
+        await conn.execute("TRUNCATE tweets_stage")
+
+
 class DatabaseMigrator:
     """Handles migration from local databases to online database"""
     
@@ -122,12 +172,7 @@ class DatabaseMigrator:
                         profile_image_url   TEXT,
                         cover_picture_url   TEXT,
 
-                        media               TEXT[],
-
-                        -- full text index column
-                        text_tsv tsvector GENERATED ALWAYS AS (
-                            to_tsvector('english', coalesce(text, ''))
-                        ) STORED
+                        media               TEXT[]
                     ) PARTITION BY RANGE (created_at);
                 """))
                 
@@ -140,40 +185,34 @@ class DatabaseMigrator:
                             d          date;
                             part_name  text;
                         BEGIN
+                            -- JIT buys nothing for DDL; skip compilation
+                            SET LOCAL jit = off;
+
                             d := start_date;
 
                             WHILE d < end_date LOOP
                                 part_name := 'tweets_' || to_char(d, 'YYYY_MM');
 
+                                -- One EXECUTE per month: the partition plus
+                                -- its three indexes go out as a single
+                                -- multi-statement string instead of four
+                                -- separate dispatches. Uniqueness is per
+                                -- partition; the full-text GIN indexes the
+                                -- to_tsvector expression (no stored column)
                                 EXECUTE format(
-                                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF tweets
-                                    FOR VALUES FROM (%L) TO (%L);',
+                                    'CREATE TABLE IF NOT EXISTS %1$I PARTITION OF tweets
+                                        FOR VALUES FROM (%2$L) TO (%3$L);
+                                    CREATE UNIQUE INDEX IF NOT EXISTS %1$I_tweet_uidx
+                                        ON %1$I (tweet_id);
+                                    CREATE INDEX IF NOT EXISTS %1$I_fts_idx
+                                        ON %1$I USING GIN (to_tsvector(''english'', coalesce(text, '''')));
+                                    CREATE INDEX IF NOT EXISTS %1$I_time_idx
+                                        ON %1$I (created_at);',
                                     part_name,
                                     d,
                                     d + interval '1 month'
                                 );
 
-                                -- 🔥 Uniqueness per partition
-                                EXECUTE format(
-                                    'CREATE UNIQUE INDEX IF NOT EXISTS %I_tweet_uidx
-                                    ON %I (tweet_id);',
-                                    part_name, part_name
-                                );
-
-                                -- Full-text
-                                EXECUTE format(
-                                    'CREATE INDEX IF NOT EXISTS %I_fts_idx
-                                    ON %I USING GIN (text_tsv);',
-                                    part_name, part_name
-                                );
-
-                                -- Time index
-                                EXECUTE format(
-                                    'CREATE INDEX IF NOT EXISTS %I_time_idx
-                                    ON %I (created_at);',
-                                    part_name, part_name
-                                );
-
                                 d := d + interval '1 month';
                             END LOOP;
                         END $$;
@@ -184,40 +223,134 @@ class DatabaseMigrator:
         finally:
             await engine.dispose()
     
-    async def get_table_count(self, db_config: dict, table_name: str = "tweets") -> int:
-        """Get total count of records in a table"""
+    async def drop_bulk_indexes(self, online_db_config: dict):
+        """Drop secondary indexes on the online partitions before bulk load
+
+        Every inserted row otherwise pays maintenance on the GIN full-text
+        and btree time index of its partition. The per-partition unique
+        index is kept: ON CONFLICT DO NOTHING depends on it.
+        """
+        logger.info("Dropping secondary partition indexes for bulk load...")
+
+        conn = await asyncpg.connect(
+            host=online_db_config['host'],
+            port=online_db_config['port'],
+            user=online_db_config['user'],
+            password=online_db_config['password'],
+            database=online_db_config['name']
+        )
+
         try:
-            conn = await asyncpg.connect(
-                host=db_config['host'],
-                port=db_config['port'],
-                user=db_config['user'],
-                password=db_config['password'],
-                database=db_config['name']
+            rows = await conn.fetch(r"""
+                SELECT indexname FROM pg_indexes
+                WHERE schemaname = 'public'
+                  AND indexname ~ '^tweets_\d{4}_\d{2}_(fts|time)_idx$'
+            """)
+            for row in rows:
+                await conn.execute(f'DROP INDEX IF EXISTS "{row["indexname"]}"')
+
+            logger.info(f"✓ Dropped {len(rows)} secondary partition indexes")
+        finally:
+            await conn.close()
+
+    async def rebuild_bulk_indexes(self, online_db_config: dict):
+        """Recreate the secondary partition indexes after the bulk load"""
+        logger.info("Rebuilding secondary partition indexes...")
+
+        conn = await asyncpg.connect(
+            host=online_db_config['host'],
+            port=online_db_config['port'],
+            user=online_db_config['user'],
+            password=online_db_config['password'],
+            database=online_db_config['name']
+        )
+
+        try:
+            # Index builds are the expensive part; give them bulk-load-sized
+            # memory and parallel workers for this session only
+            await conn.execute("""
+                SET maintenance_work_mem = '1GB';
+                SET max_parallel_maintenance_workers = 4;
+            """)
+            await conn.execute("""
+                DO $$
+                    DECLARE
+                        part record;
+                    BEGIN
+                        FOR part IN
+                            SELECT c.relname
+                            FROM pg_class c
+                            JOIN pg_inherits i ON c.oid = i.inhrelid
+                            WHERE i.inhparent = 'tweets'::regclass
+                        LOOP
+                            EXECUTE format(
+                                'CREATE INDEX IF NOT EXISTS %I
+                                ON %I USING GIN (to_tsvector(''english'', coalesce(text, '''')));',
+                                part.relname || '_fts_idx', part.relname
+                            );
+
+                            EXECUTE format(
+                                'CREATE INDEX IF NOT EXISTS %I
+                                ON %I (created_at);',
+                                part.relname || '_time_idx', part.relname
+                            );
+                        END LOOP;
+                    END $$;
+            """)
+            logger.info("✓ Secondary partition indexes rebuilt")
+        finally:
+            await conn.close()
+
+    async def get_table_count(self, conn: asyncpg.Connection, table_name: str = "tweets") -> int:
+        """Estimate the row count of a table from planner statistics
+
+        reltuples is O(1) where COUNT(*) scans the whole heap; the value is
+        only used for progress display, so an estimate is plenty. It can be
+        0 or -1 before the first VACUUM/ANALYZE, in which case progress is
+        reported without a percentage.
+        """
+        try:
+            result = await conn.fetchval(
+                "SELECT reltuples::bigint FROM pg_class WHERE relname = $1",
+                table_name
             )
-            
-            try:
-                result = await conn.fetchval(f"SELECT COUNT(*) FROM {table_name}")
-                return result or 0
-            finally:
-                await conn.close()
+            return max(result or 0, 0)
         except Exception as e:
-            logger.error(f"Error getting count from {db_config['name']}: {e}")
+            logger.error(f"Error estimating count for {table_name}: {e}")
             return 0
     
-    async def migrate_database(self, local_db_config: dict, online_db_config: dict) -> tuple[int, int]:
+    @staticmethod
+    async def _setup_writer(conn):
+        """Pool setup hook: give every pooled writer its own staging table
+
+        The staging table is TEMP, so each pooled connection carries an
+        independent copy and concurrent migrations never collide on it.
+        Batches are bulk-loaded with the COPY protocol (no per-row
+        parse/plan round-trips) and then merged into tweets with
+        ON CONFLICT DO NOTHING semantics.
+        """
+        await conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS tweets_stage
+            (LIKE tweets INCLUDING DEFAULTS)
+        """)
+
+        # Bulk-load session tuning: the defaults are sized for OLTP. These
+        # are session-scoped, so other users of the online DB are unaffected;
+        # synchronous_commit=off risks only the last batch on a crash, and
+        # the migration is rerunnable (ON CONFLICT DO NOTHING)
+        await conn.execute("""
+            SET synchronous_commit = off;
+            SET work_mem = '256MB';
+            SET maintenance_work_mem = '1GB';
+            SET max_parallel_maintenance_workers = 4;
+        """)
+
+    async def migrate_database(self, local_db_config: dict, online_pool: asyncpg.Pool) -> tuple[int, int]:
         """Migrate data from one local database to online database"""
         db_name = local_db_config['name']
         logger.info(f"Starting migration from {db_name}...")
-        
-        # Get total count for progress tracking
-        total_count = await self.get_table_count(local_db_config)
-        if total_count == 0:
-            logger.info(f"No data found in {db_name}")
-            return 0, 0
-        
-        logger.info(f"Found {total_count:,} tweets in {db_name}")
-        
-        # Connect to both databases
+
+        # Connect to the local source; online writes go through the shared pool
         local_conn = await asyncpg.connect(
             host=local_db_config['host'],
             port=local_db_config['port'],
@@ -225,82 +358,131 @@ class DatabaseMigrator:
             password=local_db_config['password'],
             database=local_db_config['name']
         )
-        
-        online_conn = await asyncpg.connect(
-            host=online_db_config['host'],
-            port=online_db_config['port'],
-            user=online_db_config['user'],
-            password=online_db_config['password'],
-            database=online_db_config['name']
-        )
-        
+
+        # Estimated count, for progress display only; the cursor stream
+        # decides when the migration is actually done
+        total_count = await self.get_table_count(local_conn)
+        if total_count > 0:
+            logger.info(f"Found ~{total_count:,} tweets in {db_name}")
+
         migrated_count = 0
         skipped_count = 0
-        
-        try:
-            # Process data in batches
-            offset = 0
-            
-            while offset < total_count:
-                # Fetch batch from local database
-                rows = await local_conn.fetch("""
-                    SELECT tweet_id, user_id, username, display_name, text, created_at, tweet_url,
-                           hashtags, followers_count, following_count, verified,
-                           language, retweet_count, reply_count, quote_count, like_count,
-                           bookmark_count, view_count, conversation_id, user_blue_verified,
-                           user_location, user_description, profile_image_url, cover_picture_url, media
-                    FROM tweets
-                    ORDER BY created_at
-                    LIMIT $1 OFFSET $2
-                """, self.batch_size, offset)
-                
-                if not rows:
-                    break
-                
-                # Insert batch into online database
+
+        # Keyset pagination reads through this composite index
+        await local_conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_tweets_created_at_tweet_id
+            ON tweets (created_at, tweet_id)
+        """)
+
+        # Small bounded queue: the producer fetches the next batch from the
+        # source while the consumer is still writing the previous one, so
+        # read and write latency overlap instead of alternating
+        batch_queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        processed_count = 0
+        last_progress_log = time.monotonic()
+
+        async def produce():
+            """Stream source rows into the queue via a server-side cursor
+
+            One query, one plan: the cursor delivers rows in pipelined
+            protocol batches of `prefetch` size, so there is no per-batch
+            parse/describe round-trip at all.
+
+            The ORDER BY (created_at, tweet_id) is load-bearing for the
+            writer, not just for batching: created_at keeps each batch
+            inside one destination partition, and tweet_id order turns the
+            inserts into that partition's unique index into sequential
+            leaf-page appends instead of random page dirtying.
+            """
+            try:
+                batch = []
+
+                async with local_conn.transaction():
+                    async for row in local_conn.cursor(f"""
+                        SELECT {_COLUMN_LIST}
+                        FROM tweets
+                        ORDER BY created_at, tweet_id
+                    """, prefetch=self.batch_size):
+                        batch.append(row)
+                        if len(batch) >= self.batch_size:
+                            await batch_queue.put(batch)
+                            batch = []
+
+                if batch:
+                    await batch_queue.put(batch)
+            finally:
+                # Always unblock the consumer, even if the stream fails
+                await batch_queue.put(None)
+
+        async def flush_bucket(part_name: str, bucket: list):
+            """Merge one month's rows straight into its child partition
+
+            Writing at the child skips the parent's per-row tuple routing,
+            and buckets for different months flush in parallel on separate
+            pooled connections. Falls back to routing through the parent
+            when the partition does not exist (dates outside the
+            pre-created range).
+            """
+            async with online_pool.acquire() as online_conn:
+                if len(bucket) < COPY_THRESHOLD:
+                    await online_conn.executemany(INSERT_TWEET_SQL, bucket)
+                    return
+
                 try:
-                    await online_conn.executemany("""
-                        INSERT INTO tweets (
-                            tweet_id, user_id, username, display_name, text, created_at, tweet_url,
-                            hashtags, followers_count, following_count, verified,
-                            language, retweet_count, reply_count, quote_count, like_count,
-                            bookmark_count, view_count, conversation_id, user_blue_verified,
-                            user_location, user_description, profile_image_url, cover_picture_url, media
-                        ) VALUES (
-                            $1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11,
-                            $12, $13, $14, $15, $16, $17, $18, $19, $20, $21, $22, $23, $24, $25
-                        )
-                        ON CONFLICT DO NOTHING
-                    """, [
-                        (
-                            row['tweet_id'], row['user_id'], row['username'], row['display_name'],
-                            row['text'], row['created_at'], row['tweet_url'], row['hashtags'],
-                            row['followers_count'], row['following_count'], row['verified'],
-                            row['language'], row['retweet_count'], row['reply_count'], row['quote_count'],
-                            row['like_count'], row['bookmark_count'], row['view_count'], row['conversation_id'],
-                            row['user_blue_verified'], row['user_location'], row['user_description'],
-                            row['profile_image_url'], row['cover_picture_url'], row['media']
-                        )
-                        for row in rows
-                    ])
-                    
-                    batch_migrated = len(rows)
-                    migrated_count += batch_migrated
-                    
-                except Exception as e:
-                    logger.error(f"Error inserting batch at offset {offset}: {e}")
-                    skipped_count += len(rows)
-                
-                offset += self.batch_size
-                
-                # Progress update
-                progress = (offset / total_count) * 100
-                logger.info(f"Progress: {progress:.1f}% ({migrated_count:,}/{total_count:,} migrated)")
-        
+                    await _merge_batch(online_conn, part_name, bucket)
+                except asyncpg.UndefinedTableError:
+                    await _merge_batch(online_conn, 'tweets', bucket)
+
+        async def consume():
+            """Drain the queue and bulk-load each batch into the online database"""
+            nonlocal migrated_count, skipped_count, processed_count, last_progress_log
+
+            while True:
+                rows = await batch_queue.get()
+                if rows is None:
+                    break
+
+                # Bucket by month so each bucket targets one child
+                # partition; with the (created_at, tweet_id) stream order a
+                # batch spans at most two months, at month boundaries
+                buckets: Dict[str, list] = {}
+                for row in rows:
+                    created = row['created_at']
+                    part_name = 'tweets_%04d_%02d' % (created.year, created.month)
+                    buckets.setdefault(part_name, []).append(row)
+
+                outcomes = await asyncio.gather(
+                    *(flush_bucket(part_name, bucket)
+                      for part_name, bucket in buckets.items()),
+                    return_exceptions=True
+                )
+
+                for bucket, outcome in zip(buckets.values(), outcomes):
+                    if isinstance(outcome, Exception):
+                        logger.error(f"Error inserting batch from {db_name}: {outcome}")
+                        skipped_count += len(bucket)
+                    else:
+                        migrated_count += len(bucket)
+
+                processed_count += len(rows)
+
+                # Progress update, throttled to one line per ~5s: at large
+                # batch counts, per-batch formatted log lines are measurable
+                # overhead and drown the log
+                now = time.monotonic()
+                if now - last_progress_log >= 5.0:
+                    last_progress_log = now
+                    if total_count > 0:
+                        progress = min((processed_count / total_count) * 100, 100.0)
+                        logger.info(f"Progress: {progress:.1f}% ({migrated_count:,}/~{total_count:,} migrated)")
+                    else:
+                        logger.info(f"Progress: {migrated_count:,} migrated")
+
+        try:
+            await asyncio.gather(produce(), consume())
         finally:
             await local_conn.close()
-            await online_conn.close()
-        
+
         logger.info(f"✓ Migration completed for {db_name}: {migrated_count:,} migrated, {skipped_count:,} skipped")
         return migrated_count, skipped_count
     
@@ -320,33 +502,72 @@ class DatabaseMigrator:
         
         # Initialize online database
         await self.initialize_online_database(self.online_database)
-        
+
         # Test all local database connections
         valid_databases = []
         for db_config in self.local_databases:
             if await self.test_connection(db_config):
                 valid_databases.append(db_config)
-        
+
         if not valid_databases:
             logger.error("No valid local databases found. Aborting migration.")
             return {}
-        
+
         logger.info(f"Found {len(valid_databases)} valid local databases")
-        
-        # Migrate each database
+
+        # Bulk load runs without secondary indexes; they are rebuilt once
+        # at the end instead of being maintained row by row. The drop only
+        # happens once there is at least one migratable source, and the
+        # rebuild sits in a finally so a failed pool setup or an
+        # interrupted load never leaves the online database unindexed
+        await self.drop_bulk_indexes(self.online_database)
+
+        try:
+            # Shared writer pool: parallel migrations reuse online connections
+            # instead of re-handshaking per source database
+            online_pool = await asyncpg.create_pool(
+                host=self.online_database['host'],
+                port=self.online_database['port'],
+                user=self.online_database['user'],
+                password=self.online_database['password'],
+                database=self.online_database['name'],
+                min_size=2,
+                max_size=8,
+                setup=DatabaseMigrator._setup_writer
+            )
+
+            # Migrate the databases concurrently; each source is IO-bound, so
+            # a bounded gather overlaps their network and commit latency
+            max_concurrent = self.migration_settings.get("max_concurrent_migrations", 4)
+            semaphore = asyncio.Semaphore(max_concurrent)
+
+            async def migrate_one(db_config: dict) -> tuple[int, int]:
+                async with semaphore:
+                    return await self.migrate_database(db_config, online_pool)
+
+            try:
+                outcomes = await asyncio.gather(
+                    *(migrate_one(db_config) for db_config in valid_databases),
+                    return_exceptions=True
+                )
+            finally:
+                await online_pool.close()
+        finally:
+            await self.rebuild_bulk_indexes(self.online_database)
+
         results = {}
         total_migrated = 0
         total_skipped = 0
-        
-        for db_config in valid_databases:
-            try:
-                migrated, skipped = await self.migrate_database(db_config, self.online_database)
+
+        for db_config, outcome in zip(valid_databases, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to migrate {db_config['name']}: {outcome}")
+                results[db_config['name']] = (0, 0)
+            else:
+                migrated, skipped = outcome
                 results[db_config['name']] = (migrated, skipped)
                 total_migrated += migrated
                 total_skipped += skipped
-            except Exception as e:
-                logger.error(f"Failed to migrate {db_config['name']}: {e}")
-                results[db_config['name']] = (0, 0)
         
         # Final summary
         logger.info("=" * 60)
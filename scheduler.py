@@ -5,20 +5,25 @@ Runs scheduled tasks like Discord alerts
 """
 
 import asyncio
-import schedule
-import time
-from datetime import datetime
+from datetime import datetime, timedelta
 from discord_alert import DiscordAlertService
 from logger import logger
 
 
+def _seconds_until_next_hour() -> float:
+    """Seconds from now until the next top of the hour"""
+    now = datetime.now()
+    next_hour = (now + timedelta(hours=1)).replace(minute=0, second=0, microsecond=0)
+    return (next_hour - now).total_seconds()
+
+
 class TaskScheduler:
     """Handles scheduled tasks"""
-    
+
     def __init__(self):
         self.alert_service = None
         self.running = False
-    
+
     def _initialize_alert_service(self):
         """Initialize the alert service with environment variables"""
         if not self.alert_service:
@@ -28,67 +33,62 @@ class TaskScheduler:
                 logger.error(f"Failed to initialize Discord alert service: {e}")
                 logger.error("Please set DISCORD_WEBHOOK_URL in your .env file")
                 raise
-    
+
     async def send_hourly_alert(self):
         """Send hourly database status alert"""
         try:
             if not self.alert_service:
                 self._initialize_alert_service()
-                
+
             logger.info("Executing scheduled database status alert...")
             success = await self.alert_service.send_status_alert()
-            
+
             if success:
                 logger.info("Scheduled alert completed successfully")
             else:
                 logger.error("Scheduled alert failed")
-                
+
         except Exception as e:
             logger.error(f"Error in scheduled alert: {e}")
-    
-    def schedule_tasks(self):
-        """Set up scheduled tasks"""
-        # Schedule hourly alerts
-        schedule.every().hour.do(lambda: asyncio.create_task(self.send_hourly_alert()))
-        
-        # Optional: Schedule at specific times
-        # schedule.every().day.at("09:00").do(lambda: asyncio.create_task(self.send_hourly_alert()))
-        # schedule.every().day.at("17:00").do(lambda: asyncio.create_task(self.send_hourly_alert()))
-        
-        logger.info("Scheduled tasks configured:")
-        logger.info("- Database status alert: Every hour")
-    
+
     async def run_scheduler(self):
         """Run the task scheduler"""
         try:
             self._initialize_alert_service()
         except ValueError:
             return  # Error already logged
-            
-        self.schedule_tasks()
+
         self.running = True
-        
+
         logger.info("Task scheduler started. Press Ctrl+C to stop.")
-        
+        logger.info("Scheduled tasks configured:")
+        logger.info("- Database status alert: Every hour, on the hour")
+
         # Send initial alert
         logger.info("Sending initial database status alert...")
         await self.send_hourly_alert()
-        
+
         try:
+            # Event-driven timer: sleep straight through to the next top of
+            # the hour instead of polling a pending-task list every minute.
+            # No wakeups between alerts, and no up-to-a-minute drift.
             while self.running:
-                # Run pending scheduled tasks
-                schedule.run_pending()
-                
-                # Sleep for 1 minute before checking again
-                await asyncio.sleep(60)
-                
+                delay = _seconds_until_next_hour()
+                # Guard against waking a moment before the hour and firing twice
+                if delay < 1.0:
+                    delay += 3600.0
+                await asyncio.sleep(delay)
+
+                if self.running:
+                    await self.send_hourly_alert()
+
         except KeyboardInterrupt:
             logger.info("Scheduler stopped by user")
             self.running = False
         except Exception as e:
             logger.error(f"Scheduler error: {e}")
             self.running = False
-    
+
     def stop(self):
         """Stop the scheduler"""
         self.running = False
@@ -98,7 +98,7 @@ class TaskScheduler:
 async def main():
     """Main function"""
     scheduler = TaskScheduler()
-    
+
     try:
         await scheduler.run_scheduler()
     except KeyboardInterrupt:
@@ -107,11 +107,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    # Install schedule if not available
-    try:
-        import schedule
-    except ImportError:
-        logger.error("Please install schedule: pip install schedule")
-        exit(1)
-    
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -10,13 +10,18 @@ async def main():
     print("Initializing databases...")
     db_manager = DatabaseManager()
 
-    for db_config in db_manager.databases:
-        print(f"\nInitializing database: {db_config['name']}")
-        try:
-            await db_manager.initialize_database(db_config)
+    # Initialize all databases concurrently; each is network-bound on its
+    # own DDL, and return_exceptions keeps one failure from hiding the rest
+    outcomes = await asyncio.gather(
+        *(db_manager.initialize_database(db_config) for db_config in db_manager.databases),
+        return_exceptions=True
+    )
+
+    for db_config, outcome in zip(db_manager.databases, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"✗ Error initializing {db_config['name']}: {outcome}")
+        else:
             print(f"✓ Successfully initialized {db_config['name']}")
-        except Exception as e:
-            print(f"✗ Error initializing {db_config['name']}: {e}")
 
     print("\nDatabase initialization complete!")
 
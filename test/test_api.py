@@ -2,22 +2,23 @@
 Test script for the Twitter Data API
 Run this after starting the server to test all endpoints
 """
-import requests
-import json
+import asyncio
+import httpx
+import orjson
 from datetime import datetime
 
 BASE_URL = "http://localhost:8000"
 
 
-def test_health_check():
+async def test_health_check(client: httpx.AsyncClient):
     """Test health check endpoint"""
     print("\n=== Testing Health Check ===")
-    response = requests.get(f"{BASE_URL}/health")
+    response = await client.get("/health")
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
 
 
-def test_receive_data():
+async def test_receive_data(client: httpx.AsyncClient):
     """Test data receive endpoint"""
     print("\n=== Testing Data Receive ===")
 
@@ -50,16 +51,13 @@ def test_receive_data():
         }
     ]
 
-    response = requests.post(
-        f"{BASE_URL}/api/data/receive",
-        json=tweet_data
-    )
+    response = await client.post("/api/data/receive", json=tweet_data)
 
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
 
 
-def test_search():
+async def test_search(client: httpx.AsyncClient):
     """Test keyword search endpoint"""
     print("\n=== Testing Keyword Search ===")
 
@@ -68,16 +66,13 @@ def test_search():
         "limit": 10
     }
 
-    response = requests.get(
-        f"{BASE_URL}/api/search",
-        params=params
-    )
+    response = await client.get("/api/search", params=params)
 
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
 
 
-def test_cookie_save():
+async def test_cookie_save(client: httpx.AsyncClient):
     """Test cookie save endpoint"""
     print("\n=== Testing Cookie Save ===")
 
@@ -87,64 +82,76 @@ def test_cookie_save():
         "auth_token": "test_encrypted_auth_token_here"
     }
 
-    response = requests.post(
-        f"{BASE_URL}/api/cookie/save",
-        json=cookie_data
-    )
+    response = await client.post("/api/cookie/save", json=cookie_data)
 
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
 
 
-def test_cookie_get():
+async def test_cookie_get(client: httpx.AsyncClient):
     """Test cookie retrieval endpoint"""
     print("\n=== Testing Cookie Get ===")
 
-    response = requests.get(f"{BASE_URL}/api/cookie/get/test_user")
+    response = await client.get("/api/cookie/get/test_user")
 
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
 
 
-def test_cookie_list():
+async def test_cookie_list(client: httpx.AsyncClient):
     """Test cookie list endpoint"""
     print("\n=== Testing Cookie List ===")
 
-    response = requests.get(f"{BASE_URL}/api/cookie/list")
+    response = await client.get("/api/cookie/list")
 
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
 
 
-def test_cookie_delete():
+async def test_cookie_delete(client: httpx.AsyncClient):
     """Test cookie deletion endpoint"""
     print("\n=== Testing Cookie Delete ===")
 
-    response = requests.delete(f"{BASE_URL}/api/cookie/delete/test_user")
+    response = await client.delete("/api/cookie/delete/test_user")
 
     print(f"Status Code: {response.status_code}")
-    print(f"Response: {json.dumps(response.json(), indent=2)}")
+    print(f"Response: {orjson.dumps(response.json(), option=orjson.OPT_INDENT_2).decode()}")
 
 
-if __name__ == "__main__":
+async def main():
     print("Testing Twitter Data API")
     print("=" * 50)
 
     try:
-        # Run all tests
-        test_health_check()
-        test_receive_data()
-        test_search()
-        test_cookie_save()
-        test_cookie_get()
-        test_cookie_list()
-        test_cookie_delete()
+        # One shared client: every request reuses the same kept-alive
+        # connection pool instead of paying a TCP handshake per call —
+        # this matters most when BASE_URL is not localhost
+        limits = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+        async with httpx.AsyncClient(base_url=BASE_URL, timeout=30.0, limits=limits) as client:
+            # Ingest first so the search below has data to find
+            await test_receive_data(client)
+
+            # Independent read-only endpoints run concurrently
+            await asyncio.gather(
+                test_health_check(client),
+                test_search(client),
+                test_cookie_list(client),
+            )
+
+            # Cookie lifecycle must stay ordered: save, then get, then delete
+            await test_cookie_save(client)
+            await test_cookie_get(client)
+            await test_cookie_delete(client)
 
         print("\n" + "=" * 50)
         print("All tests completed!")
 
-    except requests.exceptions.ConnectionError:
+    except httpx.ConnectError:
         print("\n❌ Error: Could not connect to server.")
         print("Make sure the server is running at http://localhost:8000")
     except Exception as e:
         print(f"\n❌ Error: {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())